@@ -0,0 +1,36 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0002_ingest_manifest.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Ingest manifest: one row per loaded statement file."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_table(
+        "ingest_manifest",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("path", sa.String(1024), nullable=False, unique=True),
+        sa.Column("size", sa.BigInteger, nullable=False),
+        sa.Column("mtime_ns", sa.BigInteger, nullable=False),
+        sa.Column("digest", sa.String(64), nullable=False),
+        sa.Column("ingestor", sa.String(50), nullable=False),
+        sa.Column("row_count", sa.Integer, nullable=False),
+        sa.Column("date_min", sa.Date, nullable=True),
+        sa.Column("date_max", sa.Date, nullable=True),
+        sa.Column("ingested_at", sa.DateTime, nullable=False),
+    )
+
+
+def downgrade() -> None:  # noqa: D401
+    op.drop_table("ingest_manifest")
@@ -0,0 +1,41 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0003_transaction_indexes_minor_units.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Transactions: (account_id, date) & date indexes, amounts in minor units."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.add_column("transactions", sa.Column("amount_minor", sa.BigInteger, nullable=True))
+    # ROUND() is half-away-from-zero while the app rounds half to even; the two
+    # only differ on sub-öre halves, which SEB exports never contain.
+    op.execute("UPDATE transactions SET amount_minor = CAST(ROUND(amount * 100) AS BIGINT)")
+    # batch mode recreates the table on SQLite, which cannot ALTER/DROP columns
+    with op.batch_alter_table("transactions") as batch:
+        batch.alter_column("amount_minor", existing_type=sa.BigInteger, nullable=False)
+        batch.drop_column("amount")
+
+    op.create_index("ix_transactions_account_id_date", "transactions", ["account_id", "date"])
+    op.create_index("ix_transactions_date", "transactions", ["date"])
+
+
+def downgrade() -> None:  # noqa: D401
+    op.drop_index("ix_transactions_date", table_name="transactions")
+    op.drop_index("ix_transactions_account_id_date", table_name="transactions")
+
+    op.add_column("transactions", sa.Column("amount", sa.Float, nullable=True))
+    op.execute("UPDATE transactions SET amount = amount_minor / 100.0")
+    with op.batch_alter_table("transactions") as batch:
+        batch.alter_column("amount", existing_type=sa.Float, nullable=False)
+        batch.drop_column("amount_minor")
@@ -0,0 +1,91 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0004_transaction_raw.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Side table for raw payloads; applies the configured RAW_STORAGE policy."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import json
+import zlib
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+from budget_app.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+BATCH = 5_000
+
+transactions = sa.table("transactions", sa.column("id", sa.Integer), sa.column("raw", sa.JSON))
+transaction_raw = sa.table(
+    "transaction_raw",
+    sa.column("transaction_id", sa.Integer),
+    sa.column("payload", sa.LargeBinary),
+)
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_table(
+        "transaction_raw",
+        sa.Column(
+            "transaction_id",
+            sa.Integer,
+            sa.ForeignKey("transactions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("payload", sa.LargeBinary, nullable=False),
+    )
+
+    policy = get_settings().RAW_STORAGE
+    if policy == "side":
+        conn = op.get_bind()
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                sa.select(transactions.c.id, transactions.c.raw)
+                .where(transactions.c.id > last_id, transactions.c.raw.is_not(None))
+                .order_by(transactions.c.id)
+                .limit(BATCH)
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                transaction_raw.insert(),
+                [
+                    {
+                        "transaction_id": pk,
+                        "payload": zlib.compress(json.dumps(raw, separators=(",", ":")).encode()),
+                    }
+                    for pk, raw in rows
+                ],
+            )
+            last_id = rows[-1][0]
+    if policy in ("side", "none"):
+        op.execute("UPDATE transactions SET raw = NULL")
+
+
+def downgrade() -> None:  # noqa: D401
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(transaction_raw.c.transaction_id, transaction_raw.c.payload)
+            .where(transaction_raw.c.transaction_id > last_id)
+            .order_by(transaction_raw.c.transaction_id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        for pk, payload in rows:
+            conn.execute(
+                transactions.update()
+                .where(transactions.c.id == pk)
+                .values(raw=json.loads(zlib.decompress(payload)))
+            )
+        last_id = rows[-1][0]
+    op.drop_table("transaction_raw")
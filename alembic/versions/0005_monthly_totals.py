@@ -0,0 +1,47 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0005_monthly_totals.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Monthly rollup table, backfilled from existing transactions."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+_MONTH = {
+    "sqlite": "date(date, 'start of month')",
+    "postgresql": "CAST(date_trunc('month', date) AS DATE)",
+}
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_table(
+        "monthly_totals",
+        sa.Column(
+            "account_id",
+            sa.Integer,
+            sa.ForeignKey("accounts.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("month", sa.Date, primary_key=True),
+        sa.Column("payee", sa.String(255), primary_key=True),
+        sa.Column("total_minor", sa.BigInteger, nullable=False),
+        sa.Column("tx_count", sa.Integer, nullable=False),
+    )
+    month = _MONTH[op.get_bind().dialect.name]
+    op.execute(
+        "INSERT INTO monthly_totals (account_id, month, payee, total_minor, tx_count) "
+        f"SELECT account_id, {month}, payee, SUM(amount_minor), COUNT(*) "
+        f"FROM transactions GROUP BY account_id, {month}, payee"
+    )
+
+
+def downgrade() -> None:  # noqa: D401
+    op.drop_table("monthly_totals")
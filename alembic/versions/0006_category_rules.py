@@ -0,0 +1,36 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0006_category_rules.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Payee categorisation rules and ``transactions.category``."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_table(
+        "category_rules",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("kind", sa.String(10), nullable=False),
+        sa.Column("pattern", sa.String(255), nullable=False),
+        sa.Column("category", sa.String(64), nullable=False),
+        sa.Column("priority", sa.Integer, nullable=False, server_default="0"),
+        sa.UniqueConstraint("kind", "pattern"),
+    )
+    op.add_column("transactions", sa.Column("category", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:  # noqa: D401
+    # batch mode recreates the table on SQLite, which cannot DROP columns
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("category")
+    op.drop_table("category_rules")
@@ -0,0 +1,51 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0007_payee_search.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Payee search: ``payee_names`` with FTS5 (SQLite) or a trigram index (PostgreSQL)."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+_SEARCH_DDL = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE payee_fts USING fts5(name, content='payee_names', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER payee_names_ai AFTER INSERT ON payee_names BEGIN "
+        "INSERT INTO payee_fts (rowid, name) VALUES (new.id, new.name); END",
+        "CREATE TRIGGER payee_names_ad AFTER DELETE ON payee_names BEGIN "
+        "INSERT INTO payee_fts (payee_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    ),
+    "postgresql": (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX ix_payee_names_name_trgm ON payee_names USING gin (name gin_trgm_ops)",
+    ),
+}
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_index("ix_transactions_payee_date", "transactions", ["payee", "date"])
+    op.create_table(
+        "payee_names",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False, unique=True),
+    )
+    for statement in _SEARCH_DDL[op.get_bind().dialect.name]:
+        op.execute(statement)
+    # the insert trigger fills the FTS5 index as well
+    op.execute("INSERT INTO payee_names (name) SELECT DISTINCT payee FROM transactions")
+
+
+def downgrade() -> None:  # noqa: D401
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE payee_fts")  # its triggers go with payee_names
+    op.drop_table("payee_names")
+    op.drop_index("ix_transactions_payee_date", table_name="transactions")
@@ -0,0 +1,53 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0008_duplicate_candidates.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Near-duplicate candidate pairs and the (account, amount, date) blocking index."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_index(
+        "ix_transactions_account_amount_date",
+        "transactions",
+        ["account_id", "amount_minor", "date"],
+    )
+    op.create_table(
+        "duplicate_candidates",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column(
+            "transaction_id",
+            sa.Integer,
+            sa.ForeignKey("transactions.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "duplicate_of_id",
+            sa.Integer,
+            sa.ForeignKey("transactions.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("score", sa.Float, nullable=False),
+        sa.Column("status", sa.String(10), nullable=False, server_default="pending"),
+        sa.Column("detected_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint("transaction_id", "duplicate_of_id"),
+    )
+    op.create_index(
+        "ix_duplicate_candidates_duplicate_of_id", "duplicate_candidates", ["duplicate_of_id"]
+    )
+    # existing rows are scanned with ``budget find-duplicates``
+
+
+def downgrade() -> None:  # noqa: D401
+    op.drop_table("duplicate_candidates")
+    op.drop_index("ix_transactions_account_amount_date", table_name="transactions")
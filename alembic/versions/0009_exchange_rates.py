@@ -0,0 +1,38 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0009_exchange_rates.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Exchange rates and base-currency amounts on transactions and rollups."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_table(
+        "exchange_rates",
+        sa.Column("currency", sa.String(3), primary_key=True),
+        sa.Column("date", sa.Date, primary_key=True),
+        sa.Column("rate", sa.Float, nullable=False),
+    )
+    op.add_column("transactions", sa.Column("amount_base_minor", sa.BigInteger, nullable=True))
+    op.add_column("monthly_totals", sa.Column("total_base_minor", sa.BigInteger, nullable=True))
+    # the base currency is a setting, so existing rows are filled with
+    # ``budget load-rates`` and ``budget backfill-fx``
+
+
+def downgrade() -> None:  # noqa: D401
+    # batch mode recreates the tables on SQLite, which cannot DROP columns
+    with op.batch_alter_table("monthly_totals") as batch:
+        batch.drop_column("total_base_minor")
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("amount_base_minor")
+    op.drop_table("exchange_rates")
@@ -0,0 +1,42 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alembic/versions/0010_import_batches.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Import batches: where each transaction came from, for cross-source duplicates."""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:  # noqa: D401 (imperative)
+    op.create_table(
+        "import_batches",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("source", sa.String(1024), nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+    # batch mode recreates the table on SQLite, which cannot add a foreign key
+    with op.batch_alter_table("transactions") as batch:
+        batch.add_column(sa.Column("batch_id", sa.Integer, nullable=True))
+        batch.create_foreign_key(
+            "fk_transactions_batch_id", "import_batches", ["batch_id"], ["id"]
+        )
+    # Pending pairs were detected without knowing the rows' sources and may
+    # be repeated purchases within one statement; existing rows keep a NULL
+    # batch and are never paired again.
+    op.execute("DELETE FROM duplicate_candidates WHERE status = 'pending'")
+
+
+def downgrade() -> None:  # noqa: D401
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_constraint("fk_transactions_batch_id", type_="foreignkey")
+        batch.drop_column("batch_id")
+    op.drop_table("import_batches")
@@ -0,0 +1,55 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# benchmarks/bench_add_transactions.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Compare the ORM and bulk insert paths of ``add_transactions``.
+
+Usage::
+
+    poetry run python benchmarks/bench_add_transactions.py --rows 100000
+"""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from budget_app.ingest.bench import synthetic_frame
+from budget_app.models import Base
+from budget_app.services.ingest_db import add_transactions
+
+
+def _run(df: pd.DataFrame, *, bulk: bool) -> tuple[float, float]:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine, autoflush=False) as sess:
+        t0 = time.perf_counter()
+        add_transactions(sess, df, bulk=bulk)
+        sess.commit()
+        first = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        add_transactions(sess, df, bulk=bulk)
+        sess.commit()
+        again = time.perf_counter() - t0
+    engine.dispose()
+    return first, again
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    print(f"{'path':<6} {'insert s':>10} {'rows/s':>12} {'re-insert s':>12}")
+    for label, bulk in (("orm", False), ("bulk", True)):
+        first, again = _run(df, bulk=bulk)
+        print(f"{label:<6} {first:>10.2f} {args.rows / first:>12,.0f} {again:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# benchmarks/bench_range_query.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Range-query latency on ``transactions`` before/after migration 0003.
+
+"before" is the 0001 layout (float amount, no secondary indexes); "after"
+has integer minor units plus the (account_id, date) and date indexes.
+
+Usage::
+
+    poetry run python benchmarks/bench_range_query.py --rows 10000000
+"""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BATCH = 200_000
+QUERIES = {
+    "account+month": (
+        "SELECT COUNT(*), SUM({amount}) FROM transactions "
+        "WHERE account_id = ? AND date BETWEEN ? AND ?",
+        (3, "2020-03-01", "2020-03-31"),
+    ),
+    "all accounts, one week": (
+        "SELECT COUNT(*), SUM({amount}) FROM transactions WHERE date BETWEEN ? AND ?",
+        ("2020-03-01", "2020-03-07"),
+    ),
+}
+
+
+def _build(path: Path, rows: int, *, indexed: bool) -> None:
+    amount_col = "amount_minor BIGINT" if indexed else "amount FLOAT"
+    con = sqlite3.connect(path)
+    con.execute(
+        "CREATE TABLE transactions (id INTEGER PRIMARY KEY, account_id INTEGER NOT NULL, "
+        f"date DATE NOT NULL, payee VARCHAR(255) NOT NULL, {amount_col} NOT NULL, "
+        "currency VARCHAR(3) NOT NULL, tx_hash VARCHAR(64) NOT NULL UNIQUE)"
+    )
+    rng = np.random.default_rng(0)
+    start = np.datetime64("2015-01-01")
+    for lo in range(0, rows, BATCH):
+        n = min(BATCH, rows - lo)
+        dates = (start + rng.integers(0, 3650, n)).astype(str)
+        cents = rng.integers(-500_000, 500_000, n)
+        amounts = cents.tolist() if indexed else (cents / 100).tolist()
+        con.executemany(
+            "INSERT INTO transactions VALUES (NULL, ?, ?, ?, ?, 'SEK', ?)",
+            zip(
+                rng.integers(0, 20, n).tolist(),
+                dates.tolist(),
+                (f"PAYEE {i % 5000}" for i in range(lo, lo + n)),
+                amounts,
+                (f"{i:064x}" for i in range(lo, lo + n)),
+                strict=True,
+            ),
+        )
+    if indexed:
+        con.execute(
+            "CREATE INDEX ix_transactions_account_id_date ON transactions (account_id, date)"
+        )
+        con.execute("CREATE INDEX ix_transactions_date ON transactions (date)")
+    con.commit()
+    con.execute("ANALYZE")
+    con.close()
+
+
+def _time(path: Path, sql: str, params: tuple[object, ...], repeat: int) -> float:
+    con = sqlite3.connect(path)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        con.execute(sql, params).fetchall()
+        samples.append(time.perf_counter() - t0)
+    con.close()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_db, after_db = Path(tmp) / "before.db", Path(tmp) / "after.db"
+        _build(before_db, args.rows, indexed=False)
+        _build(after_db, args.rows, indexed=True)
+
+        print(f"{args.rows:,} rows, median of {args.repeat}")
+        for label, (sql, params) in QUERIES.items():
+            before = _time(before_db, sql.format(amount="amount"), params, args.repeat)
+            after = _time(after_db, sql.format(amount="amount_minor"), params, args.repeat)
+            print(f"{label:<24} before {before * 1e3:>9.2f} ms   after {after * 1e3:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# benchmarks/bench_seb_parse.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Compare the C-engine SEB parser with the legacy python-engine path.
+
+Usage::
+
+    poetry run python benchmarks/bench_seb_parse.py --rows 1000000
+"""
+# ruff: noqa: I001
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from budget_app.ingest.bench import write_seb_export
+from budget_app.ingest.seb import SEBIngestor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "5000123456789.csv"
+        write_seb_export(path, args.rows)
+        ing = SEBIngestor()
+        results = {}
+        for label, fn in (("python", ing._parse_python_engine), ("c", ing.parse)):
+            t0 = time.perf_counter()
+            results[label] = fn(path)
+            elapsed = time.perf_counter() - t0
+            print(f"{label:<7} {elapsed:>8.2f} s  {args.rows / elapsed:>12,.0f} rows/s")
+        pd.testing.assert_frame_equal(results["python"], results["c"])
+
+
+if __name__ == "__main__":
+    main()
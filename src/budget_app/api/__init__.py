@@ -0,0 +1,13 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/api/__init__.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Read-only HTTP API over stored accounts & transactions.
+
+Run with::
+
+    poetry run uvicorn budget_app.api:app
+"""
+
+from .app import app
+
+__all__ = ["app"]
@@ -0,0 +1,30 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/api/app.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""FastAPI application factory."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from ..db import get_async_engine
+from . import transactions
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Close pooled connections on shutdown (only if the engine was ever built)
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+
+def create_app() -> FastAPI:
+    api = FastAPI(title="budget_app", lifespan=_lifespan)
+    api.include_router(transactions.router)
+    return api
+
+
+app = create_app()
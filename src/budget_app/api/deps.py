@@ -0,0 +1,28 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/api/deps.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Request dependencies (override these in tests)."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..db import get_async_sessionmaker
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return get_async_sessionmaker()
+
+
+SessionFactory = Annotated[async_sessionmaker[AsyncSession], Depends(get_sessionmaker)]
+
+
+async def get_session(factory: SessionFactory) -> AsyncIterator[AsyncSession]:
+    async with factory() as session:
+        yield session
+
+
+DbSession = Annotated[AsyncSession, Depends(get_session)]
@@ -0,0 +1,37 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/api/schemas.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Response models."""
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class AccountOut(BaseModel):
+    id: int
+    name: str
+    currency: str
+    institution: str
+
+
+class TransactionOut(BaseModel):
+    id: int
+    account: str
+    date: date
+    payee: str
+    amount: float
+    currency: str
+
+
+class TransactionPage(BaseModel):
+    items: list[TransactionOut]
+    # Opaque keyset token; pass back as ?cursor= to fetch the next page
+    next_cursor: str | None
+
+
+class PayeeMatch(BaseModel):
+    payee: str
+    # Higher is better; only comparable within one database backend
+    score: float
@@ -0,0 +1,193 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/api/transactions.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Account & transaction read endpoints with keyset pagination, export and payee search."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Annotated, Any, Final, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, Select, literal, select, tuple_
+
+from ..models import MINOR_UNITS, Account, Transaction, to_minor
+from ..services import search
+from .deps import DbSession, SessionFactory
+from .schemas import AccountOut, PayeeMatch, TransactionOut, TransactionPage
+
+EXPORT_BATCH: Final = 1_000
+EXPORT_COLUMNS: Final = ("id", "account", "date", "payee", "amount", "currency")
+
+router = APIRouter()
+
+
+@dataclass(slots=True)
+class TransactionFilter:
+    """Query-string filters shared by the list and export endpoints."""
+
+    account: str | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    amount_min: float | None = None
+    amount_max: float | None = None
+    payee: str | None = None
+    q: str | None = None
+
+    def apply(self, stmt: Select[Any], dialect: str) -> Select[Any]:
+        if self.account is not None:
+            stmt = stmt.where(Account.name == self.account)
+        if self.date_from is not None:
+            stmt = stmt.where(Transaction.date >= self.date_from)
+        if self.date_to is not None:
+            stmt = stmt.where(Transaction.date <= self.date_to)
+        if self.amount_min is not None:
+            stmt = stmt.where(Transaction.amount_minor >= to_minor(self.amount_min))
+        if self.amount_max is not None:
+            stmt = stmt.where(Transaction.amount_minor <= to_minor(self.amount_max))
+        if self.payee:
+            escaped = self.payee.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            stmt = stmt.where(Transaction.payee.ilike(f"%{escaped}%", escape="\\"))
+        if self.q:
+            stmt = stmt.where(search.payee_filter(dialect, self.q))
+        return stmt
+
+
+def _filters(
+    account: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    amount_min: float | None = None,
+    amount_max: float | None = None,
+    payee: Annotated[str | None, Query(description="Case-insensitive substring")] = None,
+    q: Annotated[str | None, Query(description="Indexed payee search, e.g. 'ica OR spot'")] = None,
+) -> TransactionFilter:
+    if q:
+        _parse_query(q)
+    return TransactionFilter(account, date_from, date_to, amount_min, amount_max, payee, q)
+
+
+def _parse_query(q: str) -> None:
+    try:
+        search.parse(q)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+Filters = Annotated[TransactionFilter, Depends(_filters)]
+
+
+def _select_rows() -> Select[Any]:
+    return select(
+        Transaction.id,
+        Account.name.label("account"),
+        Transaction.date,
+        Transaction.payee,
+        Transaction.amount_minor,
+        Transaction.currency,
+    ).join(Account, Transaction.account_id == Account.id)
+
+
+def _as_dict(row: Row[Any]) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "account": row.account,
+        "date": row.date,
+        "payee": row.payee,
+        "amount": row.amount_minor / MINOR_UNITS,
+        "currency": row.currency,
+    }
+
+
+def _encode_cursor(row: Row[Any]) -> str:
+    return f"{row.date.isoformat()}.{row.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        day, _, pk = cursor.partition(".")
+        return date.fromisoformat(day), int(pk)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Malformed cursor") from exc
+
+
+@router.get("/accounts", response_model=list[AccountOut])
+async def list_accounts(session: DbSession) -> Sequence[Account]:
+    return (await session.scalars(select(Account).order_by(Account.name))).all()
+
+
+@router.get("/transactions", response_model=TransactionPage)
+async def list_transactions(
+    session: DbSession,
+    filters: Filters,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> TransactionPage:
+    """Newest first, paged by a (date, id) keyset instead of OFFSET.
+
+    Deep pages therefore cost the same index seek as the first one.
+    """
+    stmt = filters.apply(_select_rows(), session.get_bind().dialect.name)
+    if cursor is not None:
+        after_date, after_id = _decode_cursor(cursor)
+        key = tuple_(Transaction.date, Transaction.id)
+        stmt = stmt.where(key < tuple_(literal(after_date), literal(after_id)))
+    stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit + 1)
+
+    rows = (await session.execute(stmt)).all()
+    page = rows[:limit]
+    return TransactionPage(
+        items=[TransactionOut(**_as_dict(r)) for r in page],
+        next_cursor=_encode_cursor(page[-1]) if len(rows) > limit else None,
+    )
+
+
+@router.get("/transactions/export")
+async def export_transactions(
+    factory: SessionFactory,
+    filters: Filters,
+    format: Literal["ndjson", "csv"] = "ndjson",
+) -> StreamingResponse:
+    """Stream every matching row (oldest first) from a server-side cursor."""
+
+    async def body() -> AsyncIterator[str]:
+        # Own session: request-scoped dependencies are closed before streaming
+        async with factory() as session:
+            stmt = filters.apply(_select_rows(), session.get_bind().dialect.name)
+            stmt = stmt.order_by(Transaction.date, Transaction.id)
+            result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH))
+            if format == "csv":
+                yield ",".join(EXPORT_COLUMNS) + "\n"
+            async for part in result.partitions():
+                buf = io.StringIO()
+                if format == "csv":
+                    writer = csv.writer(buf, lineterminator="\n")
+                    writer.writerows([_as_dict(r)[c] for c in EXPORT_COLUMNS] for r in part)
+                else:
+                    for r in part:
+                        buf.write(json.dumps(_as_dict(r), default=str, ensure_ascii=False))
+                        buf.write("\n")
+                yield buf.getvalue()
+
+    media = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media)
+
+
+@router.get("/payees/search", response_model=list[PayeeMatch])
+async def search_payees(
+    session: DbSession,
+    q: str,
+    prefix: bool = True,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> list[PayeeMatch]:
+    """Ranked payee matches; words are AND-ed, ``OR`` separates alternatives."""
+    _parse_query(q)
+    stmt = search.payee_matches(session.get_bind().dialect.name, q, prefix=prefix)
+    rows = await session.execute(stmt.limit(limit).offset(offset))
+    return [PayeeMatch(payee=name, score=score) for name, score in rows]
@@ -5,12 +5,35 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Where Transaction.raw payloads live: in the hot row, compressed in the
+# transaction_raw side table, or nowhere.
+RawStorage = Literal["inline", "side", "none"]
+
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+pysqlite:///./budget.db"
+    # Derived from DATABASE_URL (asyncpg / aiosqlite driver) when unset
+    ASYNC_DATABASE_URL: str | None = None
+    RAW_STORAGE: RawStorage = "inline"
+    # Currency that Transaction.amount_base_minor and cross-currency totals use
+    BASE_CURRENCY: str = "SEK"
+
+    # Connection pool (ignored by SQLite, which pools per file/thread)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite profile, applied to each new connection of a file-backed DB
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers and the writer do not block each other
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # durable at checkpoints; safe with WAL
+    SQLITE_CACHE_SIZE: int = -65_536  # negative = KiB, i.e. 64 MiB of page cache
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 60_000  # how long a writer queues for the lock
+    SQLITE_TEMP_STORE: str = "MEMORY"
 
     model_config = SettingsConfigDict(
         env_file=".env",
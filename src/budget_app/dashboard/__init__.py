@@ -0,0 +1,9 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/dashboard/__init__.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Streamlit dashboard; the Streamlit-free data layer lives in :mod:`.data`.
+
+Run with::
+
+    poetry run streamlit run src/budget_app/dashboard/app.py
+"""
@@ -0,0 +1,108 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/dashboard/app.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Streamlit dashboard over the stored transactions.
+
+Run with::
+
+    poetry run streamlit run src/budget_app/dashboard/app.py
+
+The transaction slice is loaded once per data version and cached; every
+widget interaction afterwards only filters and groups the cached frame.
+"""
+from __future__ import annotations
+
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Final
+
+import pandas as pd
+import streamlit as st
+
+from budget_app.dashboard.data import (
+    data_version,
+    filter_frame,
+    load_transactions,
+    monthly_by_account,
+    top_payees,
+)
+from budget_app.db import get_sessionmaker, session_scope
+from budget_app.ingest import get_matching_ingestor
+from budget_app.services.ingest_db import add_transactions
+
+DATA_TTL: Final = 3600  # seconds; upper bound on staleness of the loaded slice
+VERSION_TTL: Final = 30  # how often to probe for rows written by other processes
+
+
+@st.cache_data(ttl=VERSION_TTL, show_spinner=False)
+def _version() -> tuple[int, int]:
+    with get_sessionmaker()() as session:
+        return data_version(session)
+
+
+@st.cache_data(ttl=DATA_TTL, max_entries=4, show_spinner="Loading transactions…")
+def _transactions(version: tuple[int, int]) -> pd.DataFrame:
+    # *version* only keys the cache: a new ingest yields a fresh entry
+    with get_sessionmaker()() as session:
+        return load_transactions(session)
+
+
+def clear_caches() -> None:
+    """Drop cached query results, e.g. right after an ingest."""
+    _version.clear()
+    _transactions.clear()
+
+
+def _ingest_upload() -> None:
+    upload = st.sidebar.file_uploader("Ingest statement", type=["csv"])
+    if upload is None or not st.sidebar.button("Load into database"):
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / upload.name  # some ingestors read the account from the name
+        path.write_bytes(upload.getvalue())
+        ingestor = get_matching_ingestor(path, use_cache=False)
+        if ingestor is None:
+            st.sidebar.error("No ingestor recognises this file.")
+            return
+        with session_scope() as session:  # queues behind a running ingest
+            inserted = add_transactions(
+                session, ingestor.ingest(path), bulk=True, source=type(ingestor).__name__
+            )
+    clear_caches()
+    st.sidebar.success(f"{inserted} new transactions")
+
+
+def main() -> None:
+    st.set_page_config(page_title="Budget", layout="wide")
+    _ingest_upload()
+    if st.sidebar.button("Reload data"):
+        clear_caches()
+
+    df = _transactions(_version())
+    if df.empty:
+        st.info("No transactions yet.")
+        return
+
+    lo, hi = df["date"].min().date(), df["date"].max().date()
+    accounts = st.sidebar.multiselect("Accounts", list(df["account"].cat.categories))
+    picked = st.sidebar.date_input("Dates", (lo, hi), min_value=lo, max_value=hi)
+    payee = st.sidebar.text_input("Payee contains")
+    start, end = picked if isinstance(picked, tuple) and len(picked) == 2 else (lo, hi)
+    view = filter_frame(
+        df,
+        accounts=accounts,
+        date_from=start if isinstance(start, date) else lo,
+        date_to=end if isinstance(end, date) else hi,
+        payee=payee,
+    )
+
+    st.metric("Transactions", f"{len(view):,}")
+    st.subheader("Net per month")
+    st.bar_chart(monthly_by_account(view))
+    st.subheader("Top payees")
+    st.dataframe(top_payees(view))
+
+
+if __name__ == "__main__":  # streamlit runs the script as __main__
+    main()
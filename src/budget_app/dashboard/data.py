@@ -0,0 +1,108 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/dashboard/data.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Dashboard data layer: load once into a compact frame, then slice in pandas.
+
+Nothing here imports Streamlit, so it can be tested and reused on its own.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+from typing import Final
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models import MINOR_UNITS, Account, Transaction
+
+CATEGORICAL: Final = ("account", "payee", "currency")
+COLUMNS: Final = ("date", "month", "account", "payee", "currency", "amount_minor")
+
+
+def data_version(session: Session) -> tuple[int, int]:
+    """Cheap ``(row count, max id)`` fingerprint that changes whenever rows are added."""
+    count, max_id = session.execute(
+        select(func.count(Transaction.id), func.max(Transaction.id))
+    ).one()
+    return int(count), int(max_id or 0)
+
+
+def load_transactions(
+    session: Session, *, date_from: date | None = None, date_to: date | None = None
+) -> pd.DataFrame:
+    """Read a transaction slice as a compact, column-typed frame.
+
+    Strings become categoricals and amounts stay integer minor units, so a
+    million rows fit in a few tens of MB and group-bys work on codes.
+    """
+    stmt = select(
+        Transaction.date,
+        Account.name.label("account"),
+        Transaction.payee,
+        Transaction.currency,
+        Transaction.amount_minor,
+    ).join(Account, Transaction.account_id == Account.id)
+    if date_from is not None:
+        stmt = stmt.where(Transaction.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Transaction.date <= date_to)
+    return compact(pd.read_sql(stmt, session.connection()))
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a raw query frame to the dashboard dtypes and add ``month``."""
+    dates = pd.to_datetime(df["date"], format="ISO8601")
+    out = pd.DataFrame(
+        {
+            "date": dates,
+            "month": dates.dt.to_period("M").dt.to_timestamp(),
+            **{c: df[c].astype("category") for c in CATEGORICAL},
+            "amount_minor": df["amount_minor"].astype("int64"),
+        }
+    )
+    return out[list(COLUMNS)]
+
+
+def filter_frame(
+    df: pd.DataFrame,
+    *,
+    accounts: Sequence[str] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    payee: str | None = None,
+) -> pd.DataFrame:
+    """Apply the sidebar filters with boolean masks (no database access).
+
+    The payee substring is matched against the categories only, then
+    mapped back to rows through the category codes.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if accounts:
+        mask &= df["account"].isin(accounts).to_numpy()
+    if date_from is not None:
+        mask &= (df["date"] >= pd.Timestamp(date_from)).to_numpy()
+    if date_to is not None:
+        mask &= (df["date"] <= pd.Timestamp(date_to)).to_numpy()
+    if payee:
+        cats = df["payee"].cat.categories
+        hits = np.flatnonzero(cats.str.contains(payee, case=False, regex=False))
+        mask &= np.isin(df["payee"].cat.codes.to_numpy(), hits)
+    return df[mask]
+
+
+def monthly_by_account(df: pd.DataFrame) -> pd.DataFrame:
+    """Net amount per month (rows) and account (columns), in major units."""
+    totals = df.groupby(["month", "account"], observed=True)["amount_minor"].sum()
+    return totals.unstack("account", fill_value=0) / MINOR_UNITS
+
+
+def top_payees(df: pd.DataFrame, n: int = 20) -> pd.DataFrame:
+    """The *n* payees with the largest absolute net amount, with row counts."""
+    grouped = df.groupby("payee", observed=True)["amount_minor"].agg(["sum", "count"])
+    top = grouped.loc[grouped["sum"].abs().nlargest(n).index]
+    return pd.DataFrame(
+        {"total": top["sum"] / MINOR_UNITS, "count": top["count"]}, index=top.index
+    )
@@ -1,32 +1,215 @@
 # ──────────────────────────────────────────────────────────────────────────────
 # src/budget_app/db.py
 # ──────────────────────────────────────────────────────────────────────────────
-"""SQLAlchemy engine & session factory."""
+"""SQLAlchemy engine & session factory (sync, plus asyncio for the API).
+
+File-backed SQLite gets a production profile on every new connection (WAL,
+``synchronous=NORMAL``, a larger page cache, mmap, ``busy_timeout``; see the
+``SQLITE_*`` settings).  WAL lets readers such as the dashboard and the API
+keep reading while an ingest writes.  Writes go through
+``session_scope(write=True)``, which serialises them: one writer per process
+via a lock, and across processes by opening the transaction with
+``BEGIN IMMEDIATE`` so a second ingest waits up to ``busy_timeout`` for the
+write lock instead of failing with "database is locked" halfway through.
+"""
 from __future__ import annotations
 
-from collections.abc import Iterator
-from contextlib import contextmanager
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Connection, Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
-from .config import get_settings
+from .config import Settings, get_settings
+from .instrumentation import stage
 from .models import Base  # noqa: F401 (needed for metadata create_all)
 
-settings = get_settings()
-_engine = create_engine(settings.DATABASE_URL, echo=False, future=True)
-SessionLocal: sessionmaker[Session] = sessionmaker(bind=_engine, autoflush=False, future=True)
+if TYPE_CHECKING:  # the asyncio extension is slow to import and only used by the API
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+# Sync driver → asyncio driver for the same database
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+# Held by session_scope(write=True) so one thread writes to SQLite at a time
+_write_lock = threading.RLock()
+
+
+def pool_options(url: str, settings: Settings) -> dict[str, Any]:
+    """Pool keyword arguments for *url*; SQLite keeps SQLAlchemy's defaults."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def async_url(settings: Settings) -> str:
+    """``ASYNC_DATABASE_URL`` or ``DATABASE_URL`` with its driver swapped for asyncio."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver known for {backend!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def is_sqlite_file(url: str | URL) -> bool:
+    """True for a SQLite URL pointing at a file rather than an in-memory database."""
+    url = make_url(url)
+    database = url.database or ""
+    return (
+        url.get_backend_name() == "sqlite"
+        and database not in ("", ":memory:")
+        and url.query.get("mode") != "memory"
+    )
+
+
+def sqlite_pragmas(settings: Settings) -> dict[str, str | int]:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def configure_sqlite(engine: Engine, settings: Settings, *, manage_begin: bool = True) -> None:
+    """Apply the SQLite profile to every connection *engine* opens.
+
+    With *manage_begin* pysqlite's own implicit ``BEGIN`` is switched off and
+    SQLAlchemy emits it instead, as ``BEGIN IMMEDIATE`` on connections that
+    carry the ``sqlite_begin="IMMEDIATE"`` execution option (the writer
+    engine) and a plain deferred ``BEGIN`` everywhere else.
+    """
+    pragmas = sqlite_pragmas(settings)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, _record: Any) -> None:
+        if manage_begin:
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    if manage_begin:
+
+        @event.listens_for(engine, "begin")
+        def _on_begin(conn: Connection) -> None:
+            mode = conn.get_execution_options().get("sqlite_begin", "")
+            conn.exec_driver_sql(f"BEGIN {mode}".rstrip())
+
+
+def build_engine(settings: Settings) -> Engine:
+    """Sync engine for ``settings.DATABASE_URL``, with the SQLite profile if it applies."""
+    engine = create_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        future=True,
+        **pool_options(settings.DATABASE_URL, settings),
+    )
+    if is_sqlite_file(settings.DATABASE_URL):
+        configure_sqlite(engine, settings)
+    return engine
+
+
+# ---------------------------------------------------------------------------
+# Sync side: nothing connects (or reads settings) until first use.
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    return build_engine(get_settings())
+
+
+@lru_cache(maxsize=1)
+def get_writer_engine() -> Engine:
+    """:func:`get_engine` (same pool) with transactions opened as ``BEGIN IMMEDIATE``."""
+    return get_engine().execution_options(sqlite_begin="IMMEDIATE")
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_engine(), autoflush=False, future=True)
+
+
+def __getattr__(name: str) -> Any:
+    # ``SessionLocal`` used to be built at import time; keep the name working
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @contextmanager
-def session_scope() -> Iterator[Session]:  # pragma: no cover
-    """Provide a transactional scope around a series of operations."""
-    session: Session = SessionLocal()
+def session_scope(*, write: bool = True) -> Iterator[Session]:
+    """Provide a transactional scope around a series of operations.
+
+    On SQLite a writing scope first waits for the process-wide writer lock
+    and takes the database write lock when its transaction starts.  Pass
+    ``write=False`` for read-only work, which never queues.
+    """
+    serialise = write and get_engine().dialect.name == "sqlite"
+    with stage("session_scope"), (_write_lock if serialise else nullcontext()):
+        factory = get_sessionmaker()
+        session: Session = factory(bind=get_writer_engine()) if serialise else factory()
+        try:
+            yield session
+            with stage("commit"):
+                session.commit()
+        except Exception:  # noqa: BLE001 (re‑raise for caller)
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+# ---------------------------------------------------------------------------
+# asyncio side: built on first use so sync-only callers never import the
+# asyncio extension or the asyncpg/aiosqlite drivers.
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    settings = get_settings()
+    url = async_url(settings)
+    engine = create_async_engine(url, echo=False, **pool_options(url, settings))
+    if is_sqlite_file(url):
+        # aiosqlite manages its own transactions; only the pragmas apply
+        configure_sqlite(engine.sync_engine, settings, manage_begin=False)
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    # expire_on_commit=False: attribute access after commit would need IO
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:  # pragma: no cover
+    """Async counterpart of :func:`session_scope`."""
+    session = get_async_sessionmaker()()
     try:
         yield session
-        session.commit()
+        await session.commit()
     except Exception:  # noqa: BLE001 (re‑raise for caller)
-        session.rollback()
+        await session.rollback()
         raise
     finally:
-        session.close()
+        await session.close()
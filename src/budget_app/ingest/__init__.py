@@ -3,12 +3,18 @@
 # ──────────────────────────────────────────────────────────────────────────────
 """Ingestion plug‑in registry and helpers."""
 
-from collections.abc import Iterable
-from importlib import metadata
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
 from pathlib import Path
+from typing import Final
 
+from ..instrumentation import stage
 from .base import BankIngestor
 
+SNIFF_LINES: Final = 5
+SNIFF_BYTES: Final = 64 * 1024
+SNIFF_CACHE_SIZE: Final = 4096
+
 # ---------------------------------------------------------------------------
 # Dynamic entry‑point discovery (optional but future‑proof).
 # Each concrete ingestor can expose itself under the group
@@ -18,31 +24,78 @@ from .base import BankIngestor
 
 
 def _discover_entrypoint_ingestors() -> Iterable[type[BankIngestor]]:
+    from importlib import metadata  # noqa: WPS433 (slow; only needed when sniffing)
+
     for ep in metadata.entry_points(group="budget_app.ingestors"):
         cls = ep.load()
         yield cls
 
 
+@lru_cache(maxsize=1)
+def ingestor_classes() -> tuple[type[BankIngestor], ...]:
+    """Built‑in + plug‑in ingestors, discovered once per process."""
+    # Built‑in ingestors (imported lazily to avoid import cycles)
+    from .seb import SEBIngestor  # noqa: WPS433 (import inside function)
+
+    return (SEBIngestor, *_discover_entrypoint_ingestors())
+
+
+def refresh_registry() -> None:
+    """Forget discovered plug‑ins and cached sniff results (e.g. after installs)."""
+    ingestor_classes.cache_clear()
+    _sniff_cache.clear()
+
+
 # ---------------------------------------------------------------------------
 # Public helper that finds an ingestor able to parse the given file.
 # ---------------------------------------------------------------------------
 
+# (resolved path, size, mtime_ns) → matching class, or None for "no match"
+_sniff_cache: dict[tuple[str, int, int], type[BankIngestor] | None] = {}
 
-def get_matching_ingestor(path: Path) -> BankIngestor | None:
-    sample = path.read_text(encoding="utf‑8", errors="ignore").splitlines()[:5]
-    head = "\n".join(sample)
 
-    # Built‑in ingestors (imported lazily to avoid import cycles)
-    from .seb import SEBIngestor  # noqa: WPS433 (import inside function)
+def read_head(path: Path, lines: int = SNIFF_LINES, max_bytes: int = SNIFF_BYTES) -> str:
+    """Return the first *lines* lines of *path*, reading at most *max_bytes*."""
+    with path.open("rb") as fh:
+        data = fh.read(max_bytes)
+    return "\n".join(data.decode("utf-8", errors="ignore").splitlines()[:lines])
 
-    candidates: list[type[BankIngestor]] = [SEBIngestor]
-    candidates.extend(_discover_entrypoint_ingestors())
 
-    for cls in candidates:
+def _sniffed(head: str) -> Iterator[BankIngestor]:
+    for cls in ingestor_classes():
         ing = cls()
         if ing.sniff(head):
-            return ing
-    return None
+            yield ing
+
+
+def get_matching_ingestor(path: Path, *, use_cache: bool = True) -> BankIngestor | None:
+    """Return a fresh ingestor for *path*, or ``None`` if no format matches.
+
+    Results are cached per (path, size, mtime), so re‑runs over unchanged
+    files skip reading and sniffing altogether.
+    """
+    with stage("sniff"):
+        key: tuple[str, int, int] | None = None
+        if use_cache:
+            st = path.stat()
+            key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+            if key in _sniff_cache:
+                cls = _sniff_cache[key]
+                return None if cls is None else cls()
+
+        match = next(_sniffed(read_head(path)), None)
+
+        if key is not None:
+            if len(_sniff_cache) >= SNIFF_CACHE_SIZE:
+                del _sniff_cache[next(iter(_sniff_cache))]  # evict oldest entry
+            _sniff_cache[key] = None if match is None else type(match)
+        return match
 
 
-__all__ = ["BankIngestor", "get_matching_ingestor"]
+__all__ = [
+    "BankIngestor",
+    "get_matching_ingestor",
+    "ingestor_classes",
+    "read_head",
+    "refresh_registry",
+]
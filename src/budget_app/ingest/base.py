@@ -4,9 +4,17 @@
 from __future__ import annotations
 
 import abc
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING, Final
 
-import pandas as pd
+from ..instrumentation import stage
+
+if TYPE_CHECKING:  # pandas is only needed by concrete ingestors at runtime
+    import pandas as pd
+
+REQUIRED_COLS: Final = {"date", "payee", "amount", "currency", "account_id"}
+DEFAULT_CHUNKSIZE: Final = 100_000
 
 
 class BankIngestor(abc.ABC):
@@ -30,13 +38,37 @@ class BankIngestor(abc.ABC):
             account_id  → str      (clearing‑nr + account‑nr)
         """
 
+    def parse_chunks(
+        self, csv_path: Path, /, chunksize: int = DEFAULT_CHUNKSIZE
+    ) -> Iterator[pd.DataFrame]:  # noqa: D401
+        """Yield the canonical DataFrame of *csv_path* in pieces of ≤ *chunksize* rows.
+
+        The default slices :py:meth:`parse`, so it bounds downstream memory
+        only.  Ingestors that can read incrementally should override it.
+        """
+        df = self.parse(csv_path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start : start + chunksize]
+
     # ---- Convenience --------------------------------------------------------
 
     def ingest(self, csv_path: Path, /) -> pd.DataFrame:  # noqa: D401
         """Gatekeeper that wraps :py:meth:`parse` with basic sanitation."""
-        df = self.parse(csv_path)
-        required = {"date", "payee", "amount", "currency", "account_id"}
-        missing = required.difference(df.columns)
-        if missing:
-            raise ValueError(f"Parsed DataFrame missing columns: {missing}")
+        with stage("parse") as st:
+            df = _check_columns(self.parse(csv_path))
+            st.rows(rows_out=len(df))
         return df
+
+    def iter_chunks(
+        self, csv_path: Path, /, chunksize: int = DEFAULT_CHUNKSIZE
+    ) -> Iterator[pd.DataFrame]:  # noqa: D401
+        """Streaming counterpart of :py:meth:`ingest` over :py:meth:`parse_chunks`."""
+        for chunk in self.parse_chunks(csv_path, chunksize):
+            yield _check_columns(chunk)
+
+
+def _check_columns(df: pd.DataFrame) -> pd.DataFrame:
+    missing = REQUIRED_COLS.difference(df.columns)
+    if missing:
+        raise ValueError(f"Parsed DataFrame missing columns: {missing}")
+    return df
@@ -0,0 +1,179 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/ingest/batch.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Parse many statement files in parallel and load them through one writer."""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from .. import instrumentation
+from ..models import IngestManifest
+from ..services.ingest_db import add_transactions
+from ..services.manifest import (
+    Change,
+    classify,
+    is_unchanged,
+    manifest_entries,
+    manifest_key,
+    record,
+    tail_file,
+)
+from . import get_matching_ingestor
+
+
+@dataclass(slots=True)
+class FileResult:
+    """Outcome of ingesting one file."""
+
+    path: Path
+    ingestor: str | None = None
+    mode: Literal["full", "tail", "skipped"] = "full"
+    rows: int = 0
+    inserted: int = 0
+    parse_seconds: float = 0.0
+    write_seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def duplicates(self) -> int:
+        return self.rows - self.inserted
+
+
+Parsed = tuple[FileResult, pd.DataFrame | None, Change | None]
+Job = tuple[Path, tuple[int, str] | None, bool]
+
+
+def expand_paths(paths: Iterable[Path], pattern: str = "*.csv") -> list[Path]:
+    """Return files in *paths*, recursing into directories with *pattern*."""
+    out: list[Path] = []
+    for p in paths:
+        if p.is_dir():
+            out.extend(sorted(f for f in p.rglob(pattern) if f.is_file()))
+        else:
+            out.append(p)
+    return out
+
+
+def parse_file(path: Path, previous: tuple[int, str] | None = None, track: bool = False) -> Parsed:
+    """Sniff + parse *path*; runs inside pool workers, so it never raises.
+
+    With *track* the file is digested and compared with its *previous*
+    manifest ``(size, digest)``: unchanged content is not parsed at all and
+    an appended file only has its new tail parsed.
+    """
+    result = FileResult(path=path)
+    change: Change | None = None
+    t0 = time.perf_counter()
+    try:
+        if track:
+            change = classify(path, previous)
+            if change.kind == "unchanged":
+                result.mode = "skipped"
+                return result, None, change
+        ingestor = get_matching_ingestor(path)
+        if ingestor is None:
+            result.error = "no ingestor found"
+            return result, None, change
+        result.ingestor = type(ingestor).__name__
+        if change is not None and change.kind == "appended":
+            result.mode = "tail"
+            with tail_file(path, change.offset) as tail:
+                df = ingestor.ingest(tail)
+        else:
+            df = ingestor.ingest(path)
+    except Exception as exc:  # noqa: BLE001 (reported per file)
+        result.error = f"{type(exc).__name__}: {exc}"
+        return result, None, change
+    finally:
+        result.parse_seconds = time.perf_counter() - t0
+    result.rows = len(df)
+    return result, df, change
+
+
+def _parsed(jobs: list[Job], workers: int | None) -> Iterator[Parsed]:
+    if workers == 1:
+        for job in jobs:
+            with instrumentation.stage("parse_file"):
+                parsed = parse_file(*job)
+            yield parsed
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures: list[Future[Parsed]] = [pool.submit(parse_file, *job) for job in jobs]
+        for fut in as_completed(futures):
+            result, df, change = fut.result()
+            # stages inside the worker are not visible here, only its total
+            instrumentation.record("parse_file", result.parse_seconds, rows_out=result.rows)
+            yield result, df, change
+
+
+def ingest_paths(
+    session: Session,
+    paths: Iterable[Path],
+    *,
+    workers: int | None = None,
+    bulk: bool = True,
+    use_manifest: bool = True,
+    reader: Session | None = None,
+) -> list[FileResult]:
+    """Parse *paths* in a process pool and write each frame as it arrives.
+
+    All DB writes happen in the calling process through *session*, committed
+    once per file, so SQLite never sees concurrent writers.  ``workers=1``
+    parses inline, which is handy for debugging.
+
+    With *use_manifest*, files whose size and mtime match the ingest
+    manifest are skipped without being opened, and the manifest is updated
+    in the same commit as each file's rows.  The manifest is looked up
+    through *reader* (default: *session*) and that transaction is closed
+    before parsing starts, so a writer session only opens its transaction,
+    and on SQLite takes the database write lock, once a frame is ready.
+    """
+    paths = list(paths)
+    entry_ids: dict[str, int] = {}
+    results: list[FileResult] = []
+    jobs: list[Job] = []
+    lookup = reader or session
+    entries = manifest_entries(lookup, paths) if use_manifest else {}
+    for path in paths:
+        entry = entries.get(manifest_key(path))
+        if entry is not None and is_unchanged(entry, path):
+            results.append(FileResult(path=path, ingestor=entry.ingestor, mode="skipped"))
+        else:
+            if entry is not None:
+                entry_ids[entry.path] = entry.id
+            previous = None if entry is None else (entry.size, entry.digest)
+            jobs.append((path, previous, use_manifest))
+    if use_manifest:
+        lookup.commit()  # end the read before the (possibly long) parsing
+
+    for result, df, change in _parsed(jobs, workers):
+        if result.error is None:
+            t0 = time.perf_counter()
+            try:
+                if df is not None:
+                    # the ingestor names the feed: statements of one account
+                    # read by the same ingestor never pair as duplicates
+                    result.inserted = add_transactions(
+                        session, df, bulk=bulk, source=result.ingestor
+                    )
+                if change is not None:
+                    entry_id = entry_ids.get(manifest_key(result.path))
+                    entry = None if entry_id is None else session.get(IngestManifest, entry_id)
+                    ingestor = result.ingestor or (entry.ingestor if entry else "")
+                    record(session, result.path, change, ingestor=ingestor, df=df, entry=entry)
+                with instrumentation.stage("commit"):
+                    session.commit()
+            except Exception as exc:  # noqa: BLE001 (reported per file)
+                session.rollback()
+                result.error = f"{type(exc).__name__}: {exc}"
+            result.write_seconds = time.perf_counter() - t0
+        results.append(result)
+    return results
@@ -0,0 +1,251 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/ingest/bench.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Ingest benchmark suite over deterministic synthetic SEB exports.
+
+Run with ``budget bench``; results are written as JSON and can be compared
+against an earlier run to flag regressions in the hot paths.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Final, Literal
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ..models import Base
+from ..services.ingest_db import add_transactions
+from . import get_matching_ingestor
+from .batch import ingest_paths
+from .seb import SEBIngestor
+
+Storage = Literal["memory", "disk"]
+STORAGES: Final[tuple[Storage, ...]] = ("memory", "disk")
+START_DATE: Final = pd.Timestamp("2015-01-01")
+PAYEES: Final = 5_000
+
+
+def synthetic_frame(rows: int, accounts: int = 3, seed: int = 0) -> pd.DataFrame:
+    """Canonical frame with *rows* unique transactions spread over *accounts*."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "date": START_DATE + pd.to_timedelta(rng.integers(0, 3650, rows), unit="D"),
+            "payee": [f"PAYEE {i}" for i in range(rows)],
+            "amount": rng.integers(-500_000, 500_000, rows) / 100,
+            "currency": "SEK",
+            "account_id": rng.integers(0, accounts, rows).astype(str),
+        }
+    )
+
+
+def write_seb_export(
+    path: Path, rows: int, *, seed: int = 0, delimiter: str = ";", duplicates: float = 0.0
+) -> None:
+    """Write a synthetic SEB export; same arguments give byte-identical files.
+
+    Amounts use space thousands separators and a decimal comma, or a decimal
+    point when *delimiter* is ``","``.  A *duplicates* fraction of the rows
+    repeats earlier lines verbatim, which ``add_transactions`` must drop.
+    """
+    rng = np.random.default_rng(seed)
+    unique = rows - int(rows * duplicates)
+    dates = (START_DATE + pd.to_timedelta(rng.integers(0, 3650, unique), unit="D")).strftime(
+        "%Y-%m-%d"
+    )
+    decimal = "." if delimiter == "," else ","
+    cents = rng.integers(-5_000_000, 5_000_000, unique).tolist()
+    amounts = [f"{c / 100:,.2f}".replace(",", " ").replace(".", decimal) for c in cents]
+    frame = pd.DataFrame(
+        {
+            "Bokföringsdatum": dates,
+            "Valutadatum": dates,
+            "Verifikationsnummer": rng.integers(10**9, 10**10, unique),
+            "Text": [f"PAYEE {i % PAYEES}" for i in range(unique)],
+            "Belopp": amounts,
+            "Saldo": amounts,
+        }
+    )
+    if unique < rows:
+        extra = rng.integers(0, unique, rows - unique)
+        frame = pd.concat([frame, frame.iloc[extra]], ignore_index=True)
+    frame.to_csv(path, sep=delimiter, index=False)
+
+
+def generate_exports(
+    directory: Path,
+    rows: int,
+    *,
+    accounts: int = 1,
+    seed: int = 0,
+    delimiter: str = ";",
+    duplicates: float = 0.0,
+) -> list[Path]:
+    """Spread *rows* over one export per account (the account is the file stem)."""
+    paths = []
+    for i in range(accounts):
+        path = directory / f"5000{i:010d}.csv"
+        share = rows // accounts + (i < rows % accounts)
+        write_seb_export(path, share, seed=seed + i, delimiter=delimiter, duplicates=duplicates)
+        paths.append(path)
+    return paths
+
+
+@dataclass(slots=True)
+class BenchResult:
+    """Timing of one benchmark case over *repeat* runs."""
+
+    name: str
+    items: int
+    median_s: float
+    min_s: float
+    repeat: int
+    unit: str = "rows"
+
+    @property
+    def per_second(self) -> float:
+        return self.items / self.median_s if self.median_s else float("inf")
+
+
+def _time(
+    name: str, items: int, repeat: int, run: Callable[[], float], unit: str = "rows"
+) -> BenchResult:
+    """*run* performs one iteration (including setup) and returns its timed part."""
+    samples = [run() for _ in range(repeat)]
+    return BenchResult(name, items, statistics.median(samples), min(samples), repeat, unit)
+
+
+@contextmanager
+def _database(storage: Storage, workdir: Path) -> Iterator[Session]:
+    db_file = workdir / "bench.db"
+    db_file.unlink(missing_ok=True)
+    url = "sqlite+pysqlite:///:memory:" if storage == "memory" else f"sqlite:///{db_file}"
+    engine = create_engine(url, future=True)
+    Base.metadata.create_all(engine)
+    try:
+        with Session(engine, autoflush=False) as session:
+            yield session
+    finally:
+        engine.dispose()
+
+
+def _insert_cases(
+    frame: pd.DataFrame, storage: Storage, workdir: Path, repeat: int
+) -> list[BenchResult]:
+    out = []
+    for bulk in (True, False):
+        path = "bulk" if bulk else "orm"
+        first: list[float] = []
+        again: list[float] = []
+        for _ in range(repeat):
+            with _database(storage, workdir) as session:
+                for samples in (first, again):
+                    t0 = time.perf_counter()
+                    add_transactions(session, frame, bulk=bulk)
+                    session.commit()
+                    samples.append(time.perf_counter() - t0)
+        for label, samples in (("insert", first), ("reinsert", again)):
+            out.append(
+                BenchResult(
+                    f"add_transactions[{storage},{path},{label}]",
+                    len(frame),
+                    statistics.median(samples),
+                    min(samples),
+                    repeat,
+                )
+            )
+    return out
+
+
+def run_suite(
+    rows: int,
+    *,
+    accounts: int = 3,
+    seed: int = 0,
+    delimiter: str = ";",
+    duplicates: float = 0.1,
+    repeat: int = 3,
+) -> list[BenchResult]:
+    """Generate exports and time sniffing, parsing, inserting and ``ingest-dir``.
+
+    ``ingest_paths`` runs with ``workers=1`` so the numbers do not depend on
+    the machine's core count.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        data = workdir / "exports"
+        data.mkdir()
+        files = generate_exports(
+            data, rows, accounts=accounts, seed=seed, delimiter=delimiter, duplicates=duplicates
+        )
+
+        def sniff() -> float:
+            t0 = time.perf_counter()
+            for f in files:
+                get_matching_ingestor(f, use_cache=False)
+            return time.perf_counter() - t0
+
+        def parse() -> float:
+            t0 = time.perf_counter()
+            for f in files:
+                SEBIngestor().parse(f)
+            return time.perf_counter() - t0
+
+        results = [
+            _time("get_matching_ingestor", len(files), repeat, sniff, unit="files"),
+            _time("SEBIngestor.parse", rows, repeat, parse),
+        ]
+        frame = pd.concat([SEBIngestor().parse(f) for f in files], ignore_index=True)
+        for storage in STORAGES:
+            results += _insert_cases(frame, storage, workdir, repeat)
+
+            def ingest(storage: Storage = storage) -> float:
+                with _database(storage, workdir) as session:
+                    t0 = time.perf_counter()
+                    ingest_paths(session, files, workers=1)
+                    return time.perf_counter() - t0
+
+            results.append(_time(f"ingest_paths[{storage}]", rows, repeat, ingest))
+    return results
+
+
+def write_results(path: Path, results: Sequence[BenchResult], **meta: Any) -> None:
+    """Store *results* as JSON together with the run parameters in *meta*."""
+    doc = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": [asdict(r) | {"per_second": r.per_second} for r in results],
+    }
+    path.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+
+
+def regressions(
+    results: Sequence[BenchResult], baseline: Path, threshold: float = 0.25
+) -> list[str]:
+    """Describe every case whose median is more than *threshold* slower than *baseline*."""
+    previous = {
+        r["name"]: r["median_s"]
+        for r in json.loads(baseline.read_text(encoding="utf-8"))["results"]
+    }
+    slower = []
+    for r in results:
+        before = previous.get(r.name)
+        if before and r.median_s > before * (1 + threshold):
+            slower.append(f"{r.name}: {before:.3f}s → {r.median_s:.3f}s")
+    return slower
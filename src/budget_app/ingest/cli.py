@@ -6,32 +6,358 @@
 Usage::
 
     poetry run budget ingest path/to/file.csv  >  normalized.csv
+    poetry run budget ingest-dir statements/ more/*.csv
+    poetry run budget rebuild-rollups
+    poetry run budget rebuild-search-index
+    poetry run budget import-rules rules.csv && poetry run budget recategorize
+    poetry run budget find-duplicates --show
+    poetry run budget merge-duplicates --candidate 7 --candidate 9
+    poetry run budget load-rates rates/EUR.csv rates/USD.csv && poetry run budget backfill-fx
+    poetry run budget export-parquet snapshots/
+    poetry run budget bench --rows 100000 --baseline bench-results.json
+    poetry run budget --stats --stats-format prometheus ingest-dir statements/
 """
 from __future__ import annotations
 
 import csv
 import sys
+from enum import StrEnum
 from pathlib import Path
 
 import typer
 
+from .. import instrumentation
 from . import get_matching_ingestor
+from .base import DEFAULT_CHUNKSIZE
+
+# Commands import pandas/SQLAlchemy-backed modules (and so build the engine)
+# only when they run, which keeps ``budget --help`` and friends fast.
 
 app = typer.Typer(help="Ingest bank‑statement files and output canonical CSV.")
 
 
+class StatsFormat(StrEnum):
+    text = "text"
+    json = "json"
+    prometheus = "prometheus"
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    stats: bool = typer.Option(
+        False, "--stats", "--profile", help="Report per-stage timings and SQL counts."
+    ),
+    stats_format: StatsFormat = typer.Option(StatsFormat.text, help="Report format."),  # noqa: B008
+    stats_file: Path | None = typer.Option(None, help="Write stats here instead of stderr."),  # noqa: B008
+) -> None:
+    """Options shared by every command."""
+    if not stats:
+        return
+    collected = ctx.with_resource(instrumentation.collect())
+
+    def report() -> None:
+        rendered = {
+            StatsFormat.text: collected.to_text,
+            StatsFormat.json: collected.to_json,
+            StatsFormat.prometheus: collected.to_prometheus,
+        }[stats_format]()
+        if stats_file is None:
+            typer.echo(rendered.rstrip("\n"), err=True)
+        else:
+            stats_file.write_text(rendered.rstrip("\n") + "\n", encoding="utf-8")
+
+    # runs before the collect() context exits, both on ctx close
+    ctx.call_on_close(report)
+
+
 @app.command()
-def ingest(path: Path) -> None:  # noqa: D401 (imperative)
+def ingest(
+    path: Path,
+    chunksize: int = typer.Option(DEFAULT_CHUNKSIZE, min=1, help="Rows per parsed chunk."),
+) -> None:  # noqa: D401 (imperative)
     """Parse *path* and stream canonical CSV to stdout."""
     ingestor = get_matching_ingestor(path)
     if ingestor is None:
         typer.echo("❌ No ingestor found for this file.", err=True)
         raise typer.Exit(code=1)
 
-    df = ingestor.ingest(path)
+    # Stream to stdout chunk by chunk so you can pipe/redirect huge files
+    for i, chunk in enumerate(ingestor.iter_chunks(path, chunksize)):
+        chunk.to_csv(sys.stdout, index=False, header=i == 0, quoting=csv.QUOTE_MINIMAL)
+
+
+@app.command("ingest-dir")
+def ingest_dir(
+    paths: list[Path],
+    pattern: str = typer.Option("*.csv", help="Glob used inside directories."),
+    workers: int = typer.Option(0, min=0, help="Parser processes (0 = CPU count)."),
+    bulk: bool = typer.Option(True, help="Use the bulk INSERT path."),
+    force: bool = typer.Option(False, help="Ignore the ingest manifest and re-parse all files."),
+) -> None:  # noqa: D401 (imperative)
+    """Parse files/directories in parallel and load them into the database.
+
+    Files already recorded in the ingest manifest are skipped when unchanged;
+    files that only grew have just their new tail parsed.
+    """
+    from ..db import session_scope
+    from .batch import expand_paths, ingest_paths
+
+    files = expand_paths(paths, pattern)
+    if not files:
+        typer.echo("❌ No files to ingest.", err=True)
+        raise typer.Exit(code=1)
+
+    # the manifest is read outside the writer, which would otherwise hold the
+    # SQLite write lock from that read until the first parsed file is written
+    with session_scope(write=False) as reader, session_scope() as session:
+        results = ingest_paths(
+            session,
+            files,
+            workers=workers or None,
+            bulk=bulk,
+            use_manifest=not force,
+            reader=reader,
+        )
+
+    for r in results:
+        if r.error:
+            typer.echo(f"✗ {r.path}: {r.error}", err=True)
+        elif r.mode == "skipped":
+            typer.echo(f"· {r.path}: unchanged, skipped")
+        else:
+            typer.echo(
+                f"✓ {r.path}: {r.rows} rows{' (tail)' if r.mode == 'tail' else ''}, "
+                f"{r.inserted} new, {r.duplicates} dup "
+                f"(parse {r.parse_seconds:.2f}s, write {r.write_seconds:.2f}s)"
+            )
+    ok = [r for r in results if not r.error]
+    skipped = sum(r.mode == "skipped" for r in ok)
+    typer.echo(
+        f"{len(ok)}/{len(results)} files ({skipped} unchanged) · "
+        f"{sum(r.rows for r in ok)} parsed · "
+        f"{sum(r.inserted for r in ok)} inserted · {sum(r.duplicates for r in ok)} deduplicated"
+    )
+    if len(ok) != len(results):
+        raise typer.Exit(code=1)
+
+
+@app.command("rebuild-rollups")
+def rebuild_rollups() -> None:  # noqa: D401 (imperative)
+    """Recompute the monthly totals table from all stored transactions."""
+    from ..db import session_scope
+    from ..services import rollups
+
+    with session_scope() as session:
+        rows = rollups.rebuild(session)
+    typer.echo(f"✓ monthly_totals rebuilt: {rows} rows")
+
+
+@app.command("rebuild-search-index")
+def rebuild_search_index() -> None:  # noqa: D401 (imperative)
+    """Recreate the payee search index from all stored transactions."""
+    from ..db import session_scope
+    from ..services import search
+
+    with session_scope() as session:
+        payees = search.rebuild_index(session)
+    typer.echo(f"✓ payee search index rebuilt: {payees} payees")
+
+
+@app.command("import-rules")
+def import_rules(
+    path: Path,
+    replace: bool = typer.Option(False, help="Delete all existing rules first."),
+) -> None:  # noqa: D401 (imperative)
+    """Load categorisation rules from a CSV with kind,pattern,category[,priority]."""
+    from sqlalchemy import delete
+
+    from ..db import session_scope
+    from ..models import CategoryRule
+    from ..services import categorize
+
+    with path.open(newline="", encoding="utf-8") as fh:
+        rules = [
+            categorize.Rule(r["kind"], r["pattern"], r["category"], int(r.get("priority") or 0))
+            for r in csv.DictReader(fh)
+        ]
+    try:
+        with session_scope() as session:
+            if replace:
+                session.execute(delete(CategoryRule))
+            added = categorize.add_rules(session, rules)
+    except ValueError as exc:
+        typer.echo(f"❌ {exc}", err=True)
+        raise typer.Exit(code=1) from exc
+    typer.echo(f"✓ {added} rules imported")
+
+
+@app.command()
+def recategorize() -> None:  # noqa: D401 (imperative)
+    """Re-apply the categorisation rules, rewriting only rows that change."""
+    from ..db import session_scope
+    from ..services import categorize
+
+    with session_scope() as session:
+        changed = categorize.recategorize(session)
+    typer.echo(f"✓ {changed} transactions recategorised")
+
+
+@app.command("find-duplicates")
+def find_duplicates(
+    since_id: int = typer.Option(0, min=0, help="Only check transactions with a higher id."),
+    window_days: int = typer.Option(3, min=0, help="Max date distance within a pair."),
+    threshold: float = typer.Option(0.8, min=0.0, max=1.0, help="Min payee similarity."),
+    show: bool = typer.Option(False, help="Print all pending pairs as CSV."),
+) -> None:  # noqa: D401 (imperative)
+    """Record near-duplicate pairs (same account/amount, close date, similar payee)."""
+    from sqlalchemy import select
+    from sqlalchemy.orm import aliased
+
+    from ..db import session_scope
+    from ..models import DuplicateCandidate, Transaction
+    from ..services import duplicates
+
+    with session_scope() as session:
+        found = duplicates.scan(
+            session, since_id=since_id, window_days=window_days, threshold=threshold
+        )
+        if show:
+            new, old = aliased(Transaction), aliased(Transaction)
+            stmt = (
+                select(
+                    DuplicateCandidate.id.label("candidate"),
+                    DuplicateCandidate.score,
+                    new.id,
+                    new.date,
+                    new.payee,
+                    old.id.label("of_id"),
+                    old.date.label("of_date"),
+                    old.payee.label("of_payee"),
+                    new.amount_minor,
+                )
+                .join(new, new.id == DuplicateCandidate.transaction_id)
+                .join(old, old.id == DuplicateCandidate.duplicate_of_id)
+                .where(DuplicateCandidate.status == "pending")
+                .order_by(DuplicateCandidate.score.desc())
+            )
+            result = session.execute(stmt)
+            writer = csv.writer(sys.stdout)
+            writer.writerow(result.keys())
+            writer.writerows(result)
+    typer.echo(f"✓ {found} new duplicate candidates", err=show)
+
+
+@app.command("merge-duplicates")
+def merge_duplicates(
+    candidate: list[int] = typer.Option([], help="Merge these candidate ids."),  # noqa: B008
+    min_score: float | None = typer.Option(
+        None, min=0.0, max=1.0, help="Merge every pending pair scoring this high instead."
+    ),
+) -> None:  # noqa: D401 (imperative)
+    """Delete the newer transaction of reviewed duplicate pairs."""
+    from ..db import session_scope
+    from ..services import duplicates
+
+    if not candidate and min_score is None:
+        raise typer.BadParameter("pass --candidate ids (see find-duplicates --show) or --min-score")
+    with session_scope() as session:
+        removed = duplicates.merge(
+            session, candidate_ids=candidate or None, min_score=min_score
+        )
+    typer.echo(f"✓ {removed} duplicate transactions removed")
+
+
+@app.command("load-rates")
+def load_rates(paths: list[Path]) -> None:  # noqa: D401 (imperative)
+    """Store exchange rates from ``date,rate[,currency]`` CSV files (EUR.csv, …)."""
+    from ..db import session_scope
+    from ..services import fx
+
+    with session_scope() as session:
+        loaded = fx.load_rates_csv(session, paths)
+    typer.echo(f"✓ {loaded} exchange rates loaded")
+
+
+@app.command("backfill-fx")
+def backfill_fx(
+    all_rows: bool = typer.Option(
+        False, "--all", help="Recompute every row, not only those without a base amount."
+    ),
+) -> None:  # noqa: D401 (imperative)
+    """Fill in base-currency amounts from the stored exchange rates."""
+    from ..db import session_scope
+    from ..services import fx
+
+    with session_scope() as session:
+        updated = fx.backfill(session, only_missing=not all_rows)
+    typer.echo(f"✓ {updated} transactions converted")
+
+
+@app.command("export-parquet")
+def export_parquet(
+    directory: Path,
+    full: bool = typer.Option(False, help="Rewrite every partition, not only changed ones."),
+) -> None:  # noqa: D401 (imperative)
+    """Write account/month-partitioned Parquet snapshots of all transactions."""
+    from ..db import session_scope
+    from ..services import snapshots
+
+    with session_scope(write=False) as session:
+        result = snapshots.export_parquet(session, directory, full=full)
+    typer.echo(
+        f"✓ {result.written} partitions written ({result.rows} rows) · "
+        f"{result.unchanged} unchanged · {result.removed} removed"
+    )
+
+
+@app.command()
+def bench(
+    rows: int = typer.Option(100_000, min=1, help="Synthetic rows across all files."),
+    accounts: int = typer.Option(3, min=1, help="One export file per account."),
+    delimiter: str = typer.Option(";", help="Field separator of the generated exports."),
+    duplicates: float = typer.Option(0.1, min=0.0, max=1.0, help="Fraction of repeated rows."),
+    repeat: int = typer.Option(3, min=1, help="Runs per case; the median is reported."),
+    seed: int = typer.Option(0, help="Generator seed."),
+    output: Path = typer.Option(Path("bench-results.json"), help="JSON results file."),  # noqa: B008
+    baseline: Path | None = typer.Option(None, help="Earlier results to compare with."),  # noqa: B008
+    threshold: float = typer.Option(0.25, min=0.0, help="Allowed slowdown vs the baseline."),
+) -> None:  # noqa: D401 (imperative)
+    """Time sniff, parse, insert and end-to-end ingest on synthetic SEB exports.
+
+    Exits with status 1 when any case is slower than *baseline* by more than
+    *threshold*.
+    """
+    from . import bench as benchmarks
+
+    results = benchmarks.run_suite(
+        rows,
+        accounts=accounts,
+        seed=seed,
+        delimiter=delimiter,
+        duplicates=duplicates,
+        repeat=repeat,
+    )
+    for r in results:
+        typer.echo(f"{r.name:<44} {r.median_s:>9.3f} s {r.per_second:>12,.0f} {r.unit}/s")
+    benchmarks.write_results(
+        output,
+        results,
+        rows=rows,
+        accounts=accounts,
+        delimiter=delimiter,
+        duplicates=duplicates,
+        repeat=repeat,
+        seed=seed,
+    )
+    typer.echo(f"✓ results written to {output}")
 
-    # Stream to stdout so you can pipe/redirect
-    df.to_csv(sys.stdout, index=False, quoting=csv.QUOTE_MINIMAL)
+    if baseline is not None:
+        slower = benchmarks.regressions(results, baseline, threshold)
+        for line in slower:
+            typer.echo(f"✗ regression {line}", err=True)
+        if slower:
+            raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":  # pragma: no cover
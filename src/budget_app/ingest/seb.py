@@ -4,20 +4,25 @@
 """Ingestor for SEB bank statement CSV exports."""
 from __future__ import annotations
 
+import csv
 import re
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Final
+from typing import Any, Final, NamedTuple
 
 import pandas as pd
 
-from .base import BankIngestor
+from . import read_head
+from .base import DEFAULT_CHUNKSIZE, BankIngestor
 
 # Header fields we *expect* in a SEB export.  The exact Swedish labels vary
 # depending on language settings; include both ENG & SWE to be safe.
 DATE_COLS: Final = ["Bokföringsdatum", "Datum", "Date"]
 AMOUNT_COLS: Final = ["Belopp", "Amount"]
 DESC_COLS: Final = ["Text", "Meddelande", "Specifikation", "Description"]
+DELIMITERS: Final = (";", ",", "\t")
 ACCOUNT_ID_RE: Final = re.compile(r"^(?P<clearing>\d{4})\s*(?P<number>\d{7,10})$")
+DECIMAL_COMMA_RE: Final = re.compile(r"^[-+]?[\d ]*\d,\d+$")
 
 
 class SEBIngestor(BankIngestor):
@@ -35,9 +40,86 @@ class SEBIngestor(BankIngestor):
     # Main parser
     # ---------------------------------------------------------------------
     def parse(self, csv_path: Path, /) -> pd.DataFrame:  # noqa: D401
+        fast = self._fast_reader(csv_path)
+        if fast is None:
+            return self._parse_python_engine(csv_path)
+        read_kwargs, colmap, account_col = fast
+        try:
+            df = pd.read_csv(csv_path, **read_kwargs)
+        except ValueError:
+            # Mixed decimal styles or odd quoting → tolerant legacy parser
+            return self._parse_python_engine(csv_path)
+        return self._finish(df.rename(columns=colmap), csv_path, account_col)
+
+    def parse_chunks(
+        self, csv_path: Path, /, chunksize: int = DEFAULT_CHUNKSIZE
+    ) -> Iterator[pd.DataFrame]:  # noqa: D401
+        fast = self._fast_reader(csv_path)
+        done = 0
+        if fast is not None:
+            read_kwargs, colmap, account_col = fast
+            try:
+                with pd.read_csv(csv_path, chunksize=chunksize, **read_kwargs) as reader:
+                    for chunk in reader:
+                        yield self._finish(chunk.rename(columns=colmap), csv_path, account_col)
+                        done += len(chunk)
+                return
+            except ValueError:
+                pass  # resume below with the tolerant parser after *done* records
+        # Re-parse from the start and drop the records already yielded: a
+        # quoted field may span lines, so *done* is not a line count.
+        with pd.read_csv(
+            csv_path, sep=None, engine="python", dtype=str, chunksize=chunksize
+        ) as reader:
+            for chunk in reader:
+                if done >= len(chunk):
+                    done -= len(chunk)
+                    continue
+                yield self._clean_python_frame(chunk.iloc[done:], csv_path)
+                done = 0
+
+    def _fast_reader(
+        self, csv_path: Path, /
+    ) -> tuple[dict[str, Any], dict[str, str], str | None] | None:
+        """Build C-engine ``read_csv`` arguments from the head of *csv_path*.
+
+        The dialect is detected per file, so one instance can parse files of
+        different dialects.  Returns ``None`` when the header lacks a required
+        column, in which case the python-engine parser is used.
+        """
+        dialect = _detect_dialect(read_head(csv_path))
+        header = [c.strip().strip('"') for c in dialect.header.split(dialect.sep)]
+        date_col = next((c for c in header if c in DATE_COLS), None)
+        amount_col = next((c for c in header if c in AMOUNT_COLS), None)
+        payee_col = next((c for c in header if c in DESC_COLS), None)
+        if date_col is None or amount_col is None or payee_col is None:
+            return None
+        account_col = next((c for c in header if c.lower().startswith("konto")), None)
+        wanted = [date_col, amount_col, payee_col]
+        wanted += [c for c in (account_col, "currency") if c is not None and c in header]
+
+        # Fast path: C engine, no delimiter sniffing, only the columns we
+        # need, and decimal/thousands handled while tokenising.  round_trip
+        # keeps float parsing bit-identical to the slow path (hashes!).
+        read_kwargs: dict[str, Any] = {
+            "sep": dialect.sep,
+            "engine": "c",
+            "usecols": wanted,
+            "dtype": {c: str for c in wanted if c != amount_col} | {amount_col: "float64"},
+            "decimal": dialect.decimal,
+            "thousands": " ",
+            "float_precision": "round_trip",
+        }
+        colmap = {date_col: "date", amount_col: "amount", payee_col: "payee"}
+        return read_kwargs, colmap, account_col
+
+    def _parse_python_engine(self, csv_path: Path, /) -> pd.DataFrame:
+        """Slow but forgiving parser: sniffed delimiter, everything read as ``str``."""
         # Detect delimiter automatically; SEB often uses ';' but older exports use ','
         df = pd.read_csv(csv_path, sep=None, engine="python", dtype=str)
+        return self._clean_python_frame(df, csv_path)
 
+    def _clean_python_frame(self, df: pd.DataFrame, csv_path: Path, /) -> pd.DataFrame:
         # --- Column harmonisation --------------------------------------
         colmap: dict[str, str] = {}
         for c in df.columns:
@@ -47,11 +129,24 @@ class SEBIngestor(BankIngestor):
                 colmap[c] = "amount"
             elif c in DESC_COLS:
                 colmap[c] = "payee"
-        df.rename(columns=colmap, inplace=True)
+        df = df.rename(columns=colmap)
 
+        # --- Amount cleanup --------------------------------------------
+        df["amount"] = (
+            df["amount"]
+            .str.replace(" ", "", regex=False)  # remove thousands sep spaces
+            .str.replace(",", ".", regex=False)  # 1 234,56 → 1234.56
+            .astype(float)
+        )
+
+        account_col = next((c for c in df.columns if c.lower().startswith("konto")), None)
+        return self._finish(df, csv_path, account_col)
+
+    @staticmethod
+    def _finish(df: pd.DataFrame, csv_path: Path, account_col: str | None) -> pd.DataFrame:
+        """Shared tail of both parsers: account, currency, dates, payee."""
         # --- Account id -------------------------------------------------
         # SEB exports sometimes include an "Account" column with clearing+number
-        account_col = next((c for c in df.columns if c.lower().startswith("konto")), None)
         if account_col:
             df["account_id"] = (
                 df[account_col].astype(str).str.strip().replace({r"\s+": ""}, regex=True)
@@ -64,14 +159,6 @@ class SEBIngestor(BankIngestor):
         if "currency" not in df.columns:
             df["currency"] = "SEK"
 
-        # --- Amount cleanup --------------------------------------------
-        df["amount"] = (
-            df["amount"]
-            .str.replace(" ", "", regex=False)  # remove thousands sep spaces
-            .str.replace(",", ".", regex=False)  # 1 234,56 → 1234.56
-            .astype(float)
-        )
-
         # --- Dates ------------------------------------------------------
         df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
 
@@ -80,3 +167,31 @@ class SEBIngestor(BankIngestor):
 
         # Keep only canonical columns in order
         return df[["date", "payee", "amount", "currency", "account_id"]]
+
+
+class _Dialect(NamedTuple):
+    header: str
+    sep: str
+    decimal: str
+
+
+def _detect_dialect(sample: str) -> _Dialect:
+    """Guess delimiter from the header line and decimal mark from the amount column."""
+    lines = sample.lstrip("\ufeff").splitlines()
+    header = lines[0] if lines else ""
+    sep = max(DELIMITERS, key=header.count)
+    decimal = "."
+    if sep != ",":
+        columns = [c.strip().strip('"') for c in header.split(sep)]
+        amount_idx = next((i for i, c in enumerate(columns) if c in AMOUNT_COLS), None)
+        if amount_idx is not None:
+            # A comma inside a ';'/tab separated amount can only be a decimal mark;
+            # payee text ("ICA 2,5 KG") says nothing about it.
+            amounts = (
+                row[amount_idx]
+                for row in csv.reader(lines[1:], delimiter=sep)
+                if len(row) > amount_idx
+            )
+            if any(DECIMAL_COMMA_RE.match(a.strip()) for a in amounts):
+                decimal = ","
+    return _Dialect(header, sep, decimal)
@@ -0,0 +1,200 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/instrumentation.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Opt-in per-stage timings and counters for the ingest pipeline.
+
+Wrap a run in :func:`collect` to get a :class:`Stats`; instrumented code
+reports through :func:`stage`.  Outside :func:`collect` a stage costs one
+``ContextVar`` lookup; the SQLAlchemy listeners are only installed by the
+first :func:`collect` and then cost the same lookup per statement.
+
+Stage times are inclusive (``add_transactions`` contains
+``add_transactions.prepare``), and SQL statements count towards every stage
+open while they run.
+"""
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Final
+
+PROMETHEUS_PREFIX: Final = "budget"
+
+
+@dataclass(slots=True)
+class Stage:
+    """Accumulated numbers for one stage name."""
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    duplicates: int = 0
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+
+    def rows(self, *, rows_in: int = 0, rows_out: int = 0, duplicates: int = 0) -> None:
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+        self.duplicates += duplicates
+
+
+class _NullStage(Stage):
+    """Yielded by :func:`stage` while collection is off; drops every report."""
+
+    __slots__ = ()
+
+    def rows(self, *, rows_in: int = 0, rows_out: int = 0, duplicates: int = 0) -> None:
+        pass
+
+
+@dataclass(slots=True)
+class Stats:
+    """Everything recorded during one :func:`collect` block."""
+
+    stages: dict[str, Stage] = field(default_factory=dict)
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    _open: list[Stage] = field(default_factory=list, repr=False)
+
+    def stage(self, name: str) -> Stage:
+        found = self.stages.get(name)
+        if found is None:
+            found = self.stages[name] = Stage(name)
+        return found
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stages": [asdict(s) for s in self.stages.values()],
+            "sql_statements": self.sql_statements,
+            "sql_seconds": self.sql_seconds,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Render as Prometheus text exposition format (all counters)."""
+        metrics = {
+            "calls": "Times the stage ran.",
+            "seconds": "Wall time spent in the stage.",
+            "rows_in": "Rows handed to the stage.",
+            "rows_out": "Rows produced or written by the stage.",
+            "duplicates": "Rows skipped as already stored.",
+            "sql_statements": "SQL statements executed within the stage.",
+            "sql_seconds": "Time spent executing SQL within the stage.",
+        }
+        lines = []
+        for attr, help_text in metrics.items():
+            metric = f"{prefix}_stage_{attr}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [
+                f'{metric}{{stage="{s.name}"}} {getattr(s, attr)}' for s in self.stages.values()
+            ]
+        for attr, help_text in (
+            ("sql_statements", "SQL statements executed."),
+            ("sql_seconds", "Time spent executing SQL."),
+        ):
+            metric = f"{prefix}_{attr}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines.append(f"{metric} {getattr(self, attr)}")
+        return "\n".join(lines) + "\n"
+
+    def to_text(self) -> str:
+        """Fixed-width table for terminals."""
+        head = f"{'stage':<32} {'calls':>6} {'seconds':>9} {'rows in':>9} {'rows out':>9} "
+        head += f"{'dups':>7} {'sql':>6} {'sql s':>8}"
+        rows = [
+            f"{s.name:<32} {s.calls:>6} {s.seconds:>9.3f} {s.rows_in:>9} {s.rows_out:>9} "
+            f"{s.duplicates:>7} {s.sql_statements:>6} {s.sql_seconds:>8.3f}"
+            for s in self.stages.values()
+        ]
+        total = f"{self.sql_statements} SQL statements in {self.sql_seconds:.3f}s"
+        return "\n".join([head, *rows, total])
+
+
+_current: ContextVar[Stats | None] = ContextVar("budget_stats", default=None)
+_DISCARD: Final = _NullStage("discarded")
+_listening = False
+
+
+def _before_execute(conn: Any, cursor: Any, stmt: Any, params: Any, ctx: Any, many: bool) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("budget_stats_t0", []).append(time.perf_counter())
+
+
+def _after_execute(conn: Any, cursor: Any, stmt: Any, params: Any, ctx: Any, many: bool) -> None:
+    starts = conn.info.get("budget_stats_t0")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.sql_statements += 1
+    stats.sql_seconds += elapsed
+    for s in stats._open:
+        s.sql_statements += 1
+        s.sql_seconds += elapsed
+
+
+def _listen() -> None:
+    global _listening
+    if not _listening:
+        # imported here so instrumented modules stay cheap to import
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+        _listening = True
+
+
+def current() -> Stats | None:
+    """The :class:`Stats` being collected, if any."""
+    return _current.get()
+
+
+@contextmanager
+def collect() -> Iterator[Stats]:
+    """Record stages and SQL executed inside the block."""
+    _listen()
+    stats = Stats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Stage]:
+    """Time the block as stage *name*; report rows through the yielded :class:`Stage`."""
+    stats = _current.get()
+    if stats is None:
+        yield _DISCARD
+        return
+    entry = stats.stage(name)
+    entry.calls += 1
+    stats._open.append(entry)
+    t0 = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry.seconds += time.perf_counter() - t0
+        stats._open.pop()
+
+
+def record(name: str, seconds: float, *, rows_in: int = 0, rows_out: int = 0) -> None:
+    """Add a stage measured elsewhere, e.g. in a worker process."""
+    stats = _current.get()
+    if stats is not None:
+        entry = stats.stage(name)
+        entry.calls += 1
+        entry.seconds += seconds
+        entry.rows(rows_in=rows_in, rows_out=rows_out)
@@ -5,17 +5,67 @@
 from __future__ import annotations
 
 import hashlib
-from datetime import datetime
-from typing import Any, Self
+import json
+import zlib
+from collections.abc import Mapping
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Final, Self, cast
 
-from sqlalchemy import JSON, Date, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    DDL,
+    JSON,
+    BigInteger,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Table,
+    UniqueConstraint,
+    event,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.dml import Insert
+
+if TYPE_CHECKING:  # the asyncio extension is slow to import and only used by the API
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# All supported currencies (SEK/EUR/USD) have two decimals.
+MINOR_UNITS: Final = 100
+
+
+def to_minor(amount: float) -> int:
+    """Convert a major-unit amount to integer minor units (round half to even)."""
+    return round(amount * MINOR_UNITS)
 
 
 class Base(DeclarativeBase):
     """Base declarative class for SQLAlchemy 2 ORM."""
 
 
+def insert_ignore(session: Session, model: type[Base], *conflict_cols: str) -> Insert:
+    """Return a core ``INSERT … ON CONFLICT DO NOTHING`` on *model*'s table.
+
+    Both SQLite (≥ 3.24) and PostgreSQL support the same clause; other
+    backends are rejected explicitly rather than silently losing dedup.
+    """
+    table = cast(Table, model.__table__)
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=list(conflict_cols))
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=list(conflict_cols))
+    raise NotImplementedError(f"Bulk insert not supported for dialect {dialect!r}")
+
+
 class Account(Base):
     __tablename__ = "accounts"
 
@@ -41,9 +91,77 @@ class Account(Base):
             session.add(acct)
         return acct
 
+    @classmethod
+    async def get_or_create_async(
+        cls,
+        *,
+        session: AsyncSession,
+        account_id: str,
+        currency: str = "SEK",
+        institution: str = "SEB",
+    ) -> Self:
+        """Async variant of :py:meth:`get_or_create`."""
+        result = await session.execute(select(cls).filter_by(name=account_id))
+        acct: Self | None = result.scalar_one_or_none()
+        if acct is None:
+            acct = cls(name=account_id, currency=currency, institution=institution)
+            session.add(acct)
+        return acct
+
+    @classmethod
+    def resolve_ids(
+        cls,
+        *,
+        session: Session,
+        accounts: Mapping[str, str],
+        institution: str = "SEB",
+    ) -> dict[str, int]:
+        """Map account names to primary keys, creating missing accounts in bulk.
+
+        *accounts* maps account name → currency (used only for new rows).
+        Costs two SELECTs and at most one INSERT regardless of batch size.
+        """
+        if not accounts:
+            return {}
+        names = list(accounts)
+        stmt = select(cls.name, cls.id).where(cls.name.in_(names))
+        ids: dict[str, int] = dict(session.execute(stmt).tuples().all())
+        missing = [n for n in names if n not in ids]
+        if missing:
+            session.execute(
+                insert_ignore(session, cls, "name"),
+                [{"name": n, "currency": accounts[n], "institution": institution} for n in missing],
+            )
+            ids.update(dict(session.execute(stmt).tuples().all()))
+        return ids
+
+
+class ImportBatch(Base):
+    """One ``add_transactions`` call (or chunked load) and where its rows came from.
+
+    *source* names the feed, e.g. the ingestor that parsed a statement
+    file, so every statement of an account from one bank shares it.
+    Near-duplicate detection only pairs rows of batches with different,
+    known sources.
+    """
+
+    __tablename__ = "import_batches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_account_id_date", "account_id", "date"),
+        Index("ix_transactions_date", "date"),
+        # payee search resolves to ``payee IN (…)``
+        Index("ix_transactions_payee_date", "payee", "date"),
+        # near-duplicate blocking: same account and amount, nearby date
+        Index("ix_transactions_account_amount_date", "account_id", "amount_minor", "date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     account_id: Mapped[int] = mapped_column(
@@ -51,18 +169,190 @@ class Transaction(Base):
     )
     date: Mapped[datetime] = mapped_column(Date, nullable=False)
     payee: Mapped[str] = mapped_column(String(255), nullable=False)
-    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    # Integer minor units (öre/cents) – exact sums, no float drift
+    amount_minor: Mapped[int] = mapped_column(BigInteger, nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    # amount_minor in Settings.BASE_CURRENCY minor units; NULL while no rate is known
+    amount_base_minor: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     tx_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
-    raw: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=True)
+    # NULL for rows loaded before batches were recorded (provenance unknown)
+    batch_id: Mapped[int | None] = mapped_column(ForeignKey("import_batches.id"), nullable=True)
+    # Set from CategoryRule at ingest; ``budget recategorize`` refreshes it
+    category: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Deferred: only loaded when accessed, so plain row queries skip it
+    raw: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True, deferred=True)
 
     account: Mapped[Account] = relationship(back_populates="transactions")
+    raw_record: Mapped[TransactionRaw | None] = relationship(
+        lazy="select", cascade="all,delete-orphan", passive_deletes=True
+    )
+
+    @property
+    def raw_payload(self) -> dict[str, Any] | None:
+        """Original input record, wherever the ``RAW_STORAGE`` policy put it."""
+        if self.raw is not None:
+            return self.raw
+        return None if self.raw_record is None else self.raw_record.data
+
+    # Major-unit view of amount_minor, usable in queries too ---------------
+    @hybrid_property
+    def amount(self) -> float:
+        return self.amount_minor / MINOR_UNITS
+
+    @amount.inplace.setter
+    def _amount_setter(self, value: float) -> None:
+        self.amount_minor = to_minor(value)
+
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls) -> ColumnElement[float | Decimal]:
+        return cls.amount_minor / MINOR_UNITS
 
     # Helper to create hash ------------------------------------------------
     @staticmethod
     def calc_hash(
         account: str, date: str, payee: str, amount: float, currency: str
     ) -> str:  # noqa: D401
+        """Dedup key; *amount* is rounded to minor units so float noise is ignored."""
+        amount = to_minor(amount) / MINOR_UNITS
         h = hashlib.sha256()
         h.update(f"{account}|{date}|{payee}|{amount}|{currency}".encode())
         return h.hexdigest()
+
+
+class IngestManifest(Base):
+    """One row per statement file already loaded, used to skip unchanged files."""
+
+    __tablename__ = "ingest_manifest"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    path: Mapped[str] = mapped_column(String(1024), nullable=False, unique=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    digest: Mapped[str] = mapped_column(String(64), nullable=False)
+    ingestor: Mapped[str] = mapped_column(String(50), nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    date_min: Mapped[date | None] = mapped_column(Date, nullable=True)
+    date_max: Mapped[date | None] = mapped_column(Date, nullable=True)
+    ingested_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+
+
+class TransactionRaw(Base):
+    """Side-table copy of a transaction's input record (zlib-compressed JSON)."""
+
+    __tablename__ = "transaction_raw"
+
+    transaction_id: Mapped[int] = mapped_column(
+        ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True
+    )
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    @staticmethod
+    def pack(data: Mapping[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+    @property
+    def data(self) -> dict[str, Any]:
+        return cast(dict[str, Any], json.loads(zlib.decompress(self.payload)))
+
+
+class CategoryRule(Base):
+    """Payee → category rule; higher *priority* wins, then lower id."""
+
+    __tablename__ = "category_rules"
+    __table_args__ = (UniqueConstraint("kind", "pattern"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(10), nullable=False)  # keyword | regex | exact
+    pattern: Mapped[str] = mapped_column(String(255), nullable=False)
+    category: Mapped[str] = mapped_column(String(64), nullable=False)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class MonthlyTotal(Base):
+    """Per account/month/payee rollup of ``transactions``, kept current on ingest."""
+
+    __tablename__ = "monthly_totals"
+
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of month
+    payee: Mapped[str] = mapped_column(String(255), primary_key=True)
+    total_minor: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_base_minor: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class ExchangeRate(Base):
+    """Units of ``Settings.BASE_CURRENCY`` per one unit of *currency* on *date*."""
+
+    __tablename__ = "exchange_rates"
+
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    rate: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class DuplicateCandidate(Base):
+    """A likely cross-source duplicate: *transaction_id* repeats *duplicate_of_id*.
+
+    The rows come from import batches with different sources, and
+    ``duplicate_of_id`` is always the older (lower id) row.  *status* is
+    ``pending`` until the pair is dismissed; merging deletes the newer row
+    and, with it, the pair.
+    """
+
+    __tablename__ = "duplicate_candidates"
+    __table_args__ = (UniqueConstraint("transaction_id", "duplicate_of_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    transaction_id: Mapped[int] = mapped_column(
+        ForeignKey("transactions.id", ondelete="CASCADE"), nullable=False
+    )
+    duplicate_of_id: Mapped[int] = mapped_column(
+        ForeignKey("transactions.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    status: Mapped[str] = mapped_column(String(10), nullable=False, default="pending")
+    detected_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+
+
+class PayeeName(Base):
+    """Each distinct payee once; the payee search index is built over this table.
+
+    On SQLite that is the external-content FTS5 table ``payee_fts``, fed by
+    triggers; on PostgreSQL a trigram GIN index on ``name``.  Both are
+    created alongside the table (see the DDL below and migration 0007).
+    """
+
+    __tablename__ = "payee_names"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+
+
+PAYEE_SEARCH_DDL: Final = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE payee_fts USING fts5(name, content='payee_names', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER payee_names_ai AFTER INSERT ON payee_names BEGIN "
+        "INSERT INTO payee_fts (rowid, name) VALUES (new.id, new.name); END",
+        "CREATE TRIGGER payee_names_ad AFTER DELETE ON payee_names BEGIN "
+        "INSERT INTO payee_fts (payee_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    ),
+    "postgresql": (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX ix_payee_names_name_trgm ON payee_names USING gin (name gin_trgm_ops)",
+    ),
+}
+
+for _dialect, _statements in PAYEE_SEARCH_DDL.items():
+    for _sql in _statements:
+        _ddl = DDL(_sql).execute_if(dialect=_dialect)  # type: ignore[no-untyped-call]
+        event.listen(PayeeName.__table__, "after_create", _ddl)
+event.listen(
+    PayeeName.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS payee_fts").execute_if(dialect="sqlite"),  # type: ignore[no-untyped-call]
+)
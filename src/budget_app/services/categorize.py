@@ -0,0 +1,199 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/services/categorize.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Service: assign categories to payees from ``category_rules``.
+
+Rules are compiled once into a :class:`Categorizer`:
+
+* ``exact`` rules become one dict lookup,
+* ``keyword`` rules (substrings) become one trie-shaped regex that reports
+  the longest keyword starting at every position; all shorter keywords
+  matching there are prefixes of it, so no match is lost,
+* ``regex`` rules (``re.search`` semantics) stay separate patterns tried in
+  priority order.  CPython's ``re`` does not factor alternations, so one
+  big ``a|b|c…`` is roughly ten times slower than the patterns on their own.
+
+All matching is case-insensitive.  Among every rule that matches a payee,
+the highest ``priority`` wins, ties going to the lower rule id.  Frames are
+categorised per *unique* payee through an LRU cache and mapped back.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import Any, Final, Literal, NamedTuple, get_args
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models import CategoryRule, Transaction
+
+RuleKind = Literal["keyword", "regex", "exact"]
+PAYEE_CACHE_SIZE: Final = 1 << 16
+RECATEGORIZE_BATCH: Final = 50_000
+
+
+class Rule(NamedTuple):
+    kind: str
+    pattern: str
+    category: str
+    priority: int = 0
+
+
+def validate(rule: Rule) -> None:
+    """Raise ``ValueError`` for a rule that cannot be compiled."""
+    if rule.kind not in get_args(RuleKind):
+        raise ValueError(f"Unknown rule kind {rule.kind!r}")
+    if not rule.pattern:
+        raise ValueError("Rule pattern must not be empty")
+    if rule.kind == "regex":
+        try:
+            re.compile(rule.pattern, re.IGNORECASE)
+        except re.error as exc:
+            raise ValueError(f"Invalid regex {rule.pattern!r}: {exc}") from exc
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching the longest of *words* at the current position."""
+    trie: dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-word marker
+
+    def emit(node: dict[str, Any]) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else f"(?:{'|'.join(alts)})"
+        # greedy "?" tries the longer continuation before stopping here
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class Categorizer:
+    """Compiled rule set; call :meth:`categorize` or :meth:`categorize_series`."""
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        ordered = sorted(enumerate(rules), key=lambda ir: (-ir[1].priority, ir[0]))
+        self.categories: list[str] = [r.category for _, r in ordered]
+        self._exact: dict[str, int] = {}
+        self._keywords: dict[str, int] = {}
+        self._regexes: list[tuple[int, re.Pattern[str]]] = []
+        for rank, (_, rule) in enumerate(ordered):
+            validate(rule)
+            if rule.kind == "exact":
+                self._exact.setdefault(rule.pattern.casefold(), rank)
+            elif rule.kind == "keyword":
+                self._keywords.setdefault(rule.pattern.casefold(), rank)
+            else:
+                self._regexes.append((rank, re.compile(rule.pattern, re.IGNORECASE)))
+        self._keyword_re = (
+            re.compile(f"(?=({_trie_pattern(self._keywords)}))") if self._keywords else None
+        )
+        self.categorize = lru_cache(maxsize=PAYEE_CACHE_SIZE)(self._categorize)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def _keyword_ranks(self, folded: str) -> Iterator[int]:
+        assert self._keyword_re is not None
+        for m in self._keyword_re.finditer(folded):
+            longest = m.group(1)
+            for end in range(1, len(longest) + 1):
+                rank = self._keywords.get(longest[:end])
+                if rank is not None:
+                    yield rank
+
+    def _categorize(self, payee: str) -> str | None:
+        folded = payee.casefold()
+        best = self._exact.get(folded, len(self.categories))
+        if self._keyword_re is not None:
+            best = min(best, min(self._keyword_ranks(folded), default=best))
+        for rank, rx in self._regexes:  # sorted by rank, so stop at the first hit
+            if rank >= best:
+                break
+            if rx.search(payee):
+                best = rank
+                break
+        return self.categories[best] if best < len(self.categories) else None
+
+    def categorize_series(self, payees: pd.Series) -> pd.Series:
+        """Categorise a whole column, evaluating each distinct payee once."""
+        codes, uniques = pd.factorize(payees)
+        # trailing None is what code -1 (missing payee) indexes
+        cats = np.array([*(self.categorize(str(p)) for p in uniques), None], dtype=object)
+        return pd.Series(cats[codes], index=payees.index, dtype=object)
+
+
+@lru_cache(maxsize=4)
+def _compiled(rules: tuple[Rule, ...]) -> Categorizer:
+    return Categorizer(rules)
+
+
+def load_rules(session: Session) -> tuple[Rule, ...]:
+    stmt = select(
+        CategoryRule.kind, CategoryRule.pattern, CategoryRule.category, CategoryRule.priority
+    ).order_by(CategoryRule.id)
+    return tuple(Rule(*row) for row in session.execute(stmt))
+
+
+def categorizer(session: Session) -> Categorizer:
+    """Compiled matcher for the stored rules; recompiled only when they change."""
+    return _compiled(load_rules(session))
+
+
+def add_rules(session: Session, rules: Iterable[Rule]) -> int:
+    """Validate and store *rules*; returns how many were added.
+
+    Raises ``ValueError`` for an invalid rule or one whose kind and pattern
+    repeat an earlier or already stored rule, before anything is written.
+    """
+    seen = {(r.kind, r.pattern) for r in load_rules(session)}
+    rows = []
+    for rule in rules:
+        validate(rule)
+        if (rule.kind, rule.pattern) in seen:
+            raise ValueError(f"Duplicate {rule.kind} rule {rule.pattern!r}")
+        seen.add((rule.kind, rule.pattern))
+        rows.append(CategoryRule(**rule._asdict()))
+    session.add_all(rows)
+    session.flush()  # ids decide ties, and later lookups must see the rules
+    return len(rows)
+
+
+def recategorize(session: Session, *, batch_size: int = RECATEGORIZE_BATCH) -> int:
+    """Re-apply the current rules to every transaction.
+
+    Rows are read in keyset batches of *batch_size* (``id > last id``), and
+    each batch's changed categories are written back with an executemany
+    UPDATE before the next batch is read, so memory stays bounded by the
+    batch size.  Returns the number of rows updated.
+    """
+    matcher = categorizer(session)
+    stmt = (
+        select(Transaction.id, Transaction.payee, Transaction.category)
+        .order_by(Transaction.id)
+        .limit(batch_size)
+    )
+    updated, last_id = 0, 0
+    while rows := session.execute(stmt.where(Transaction.id > last_id)).all():
+        df = pd.DataFrame(rows, columns=["id", "payee", "category"])
+        last_id = int(df["id"].iloc[-1])
+        new = matcher.categorize_series(df["payee"])
+        changed = new.fillna("\0") != df["category"].fillna("\0")
+        if changed.any():
+            session.execute(
+                update(Transaction),
+                [
+                    {"id": i, "category": c}
+                    for i, c in zip(df["id"][changed].tolist(), new[changed].tolist(), strict=True)
+                ],
+            )
+            updated += int(changed.sum())
+    return updated
@@ -0,0 +1,254 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/services/duplicates.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Service: near-duplicate detection across sources.
+
+``tx_hash`` only catches exact repeats.  The same purchase arriving from a
+card export and an account export, or as a pending and then a booked
+entry, differs in payee text and often by a day.  Such pairs are found by
+*blocking*: a row is only compared with rows of the same account, currency
+and amount dated within ``window_days`` of it, which the
+``(account_id, amount_minor, date)`` index answers with one range seek per
+row.  Within a block, normalised payees are scored with :func:`similarity`
+and pairs at or above *threshold* are stored as :class:`DuplicateCandidate`
+rows for review (:func:`dismiss`) or :func:`merge`.
+
+Only rows from different feeds are compared: both rows' import batches
+must name a source (see :class:`ImportBatch`), i.e. the ingestor that read
+them, and the sources must differ.  Since blocking also requires the same
+account, two statements of one account from the same bank are one feed:
+repeated identical purchases (four coffees on four days, or one on Jan 31
+and one on Feb 1 in consecutive statements) are real transactions, and
+rows of unknown provenance are never paired.  Even across feeds a pair is
+only a suggestion, so :func:`merge` never deletes anything unless told
+which pairs or what score to merge.
+
+Detection is incremental: :func:`add_transactions` runs it on the rows it
+just inserted, and :func:`scan` processes any id range (e.g. a backfill).
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections.abc import Iterable, Sequence
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Any, Final
+
+from sqlalchemy import Date, and_, cast, delete, func, literal, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import ColumnElement
+
+from ..models import (
+    DuplicateCandidate,
+    ImportBatch,
+    Transaction,
+    TransactionRaw,
+    insert_ignore,
+)
+from . import rollups
+
+WINDOW_DAYS: Final = 3
+THRESHOLD: Final = 0.8
+SCAN_BATCH: Final = 50_000
+# Stays below SQLite's historical 999 bound-parameter limit.
+LOOKUP_CHUNK_SIZE: Final = 900
+PAYEE_CACHE_SIZE: Final = 1 << 16
+
+_NON_WORD = re.compile(r"[\W_]+")
+_NUMBERY = re.compile(r"\d")  # card numbers, dates, references
+_IDENTIFIER = re.compile(r"\d{6,}")  # phone, account or Swish numbers name the counterparty
+
+
+@lru_cache(maxsize=PAYEE_CACHE_SIZE)
+def normalise(payee: str) -> str:
+    """Casefolded words of *payee* without diacritics or tokens containing digits."""
+    folded = unicodedata.normalize("NFKD", payee.casefold())
+    ascii_ish = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return " ".join(w for w in _NON_WORD.split(ascii_ish) if w and not _NUMBERY.search(w))
+
+
+def similarity(a: str, b: str) -> float:
+    """Score two payees in ``[0, 1]``.
+
+    The best of the plain and the word-sorted edit ratio, and 0.9 when all
+    words of one payee appear in the other (``"ica nara"`` vs
+    ``"ica nara lund"``).  Payees that both carry long numbers but share
+    none (``"SWISH 46701…"`` vs ``"SWISH 46707…"``) score 0.
+    """
+    ids_a, ids_b = set(_IDENTIFIER.findall(a)), set(_IDENTIFIER.findall(b))
+    if ids_a and ids_b and not ids_a & ids_b:
+        return 0.0
+    na, nb = normalise(a), normalise(b)
+    if na == nb:
+        return 1.0
+    if not na or not nb:
+        return 0.0
+    wa, wb = na.split(), nb.split()
+    score = max(
+        SequenceMatcher(None, na, nb).ratio(),
+        SequenceMatcher(None, " ".join(sorted(wa)), " ".join(sorted(wb))).ratio(),
+    )
+    if set(wa) <= set(wb) or set(wb) <= set(wa):
+        score = max(score, 0.9)
+    return score
+
+
+def _shifted(session: Session, day: Any, days: int) -> ColumnElement[Any]:
+    """SQL for *day* moved by *days* in the bound dialect."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return func.date(day, f"{days:+d} days")
+    if dialect == "postgresql":
+        return cast(day + literal(days), Date)
+    raise NotImplementedError(f"duplicate detection is not supported on {dialect!r}")
+
+
+def _blocked_pairs(
+    session: Session,
+    window_days: int,
+    *,
+    ids: Sequence[int] | None = None,
+    id_range: tuple[int, int] | None = None,
+) -> list[tuple[int, int, str, str]]:
+    """``(id, other id, payee, other payee)`` for the given rows and their blocks."""
+    new, other = aliased(Transaction), aliased(Transaction)
+    new_batch, other_batch = aliased(ImportBatch), aliased(ImportBatch)
+    stmt = (
+        select(new.id, other.id, new.payee, other.payee)
+        .join(new_batch, new_batch.id == new.batch_id)
+        .join(
+            other,
+            and_(
+                other.account_id == new.account_id,
+                other.amount_minor == new.amount_minor,
+                other.date.between(
+                    _shifted(session, new.date, -window_days),
+                    _shifted(session, new.date, window_days),
+                ),
+                other.currency == new.currency,
+                other.batch_id != new.batch_id,
+            ),
+        )
+        # inner joins and ``!=`` also drop rows whose batch or source is unknown
+        .join(other_batch, other_batch.id == other.batch_id)
+        .where(new_batch.source != other_batch.source)
+    )
+    if ids is not None:
+        stmt = stmt.where(new.id.in_(ids))
+    if id_range is not None:
+        stmt = stmt.where(new.id.between(*id_range))
+    return [(a, b, pa, pb) for a, b, pa, pb in session.execute(stmt)]
+
+
+def _record(
+    session: Session, pairs: Iterable[tuple[int, int, str, str]], threshold: float
+) -> int:
+    """Score *pairs* and store those at or above *threshold*; returns how many were new."""
+    rows: dict[tuple[int, int], float] = {}
+    for a, b, payee_a, payee_b in pairs:
+        key = (max(a, b), min(a, b))  # both directions show up when both rows are new
+        if key not in rows:
+            rows[key] = similarity(payee_a, payee_b)
+    fresh = [
+        {"transaction_id": tx, "duplicate_of_id": of, "score": score, "status": "pending"}
+        for (tx, of), score in rows.items()
+        if score >= threshold
+    ]
+    if not fresh:
+        return 0
+    stmt = insert_ignore(session, DuplicateCandidate, "transaction_id", "duplicate_of_id")
+    # RETURNING only reports rows actually written, not already-known pairs
+    return len(session.execute(stmt.returning(DuplicateCandidate.id), fresh).all())
+
+
+def find_candidates(
+    session: Session,
+    ids: Iterable[int],
+    *,
+    window_days: int = WINDOW_DAYS,
+    threshold: float = THRESHOLD,
+) -> int:
+    """Look for near-duplicates of the transactions *ids* (e.g. just inserted)."""
+    ids = list(ids)
+    found = 0
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        chunk = ids[start : start + LOOKUP_CHUNK_SIZE]
+        found += _record(session, _blocked_pairs(session, window_days, ids=chunk), threshold)
+    return found
+
+
+def scan(
+    session: Session,
+    *,
+    since_id: int = 0,
+    window_days: int = WINDOW_DAYS,
+    threshold: float = THRESHOLD,
+    batch_size: int = SCAN_BATCH,
+) -> int:
+    """:func:`find_candidates` for every transaction with an id above *since_id*."""
+    top = session.scalar(select(func.max(Transaction.id))) or 0
+    found = 0
+    for low in range(since_id + 1, top + 1, batch_size):
+        pairs = _blocked_pairs(session, window_days, id_range=(low, low + batch_size - 1))
+        found += _record(session, pairs, threshold)
+    return found
+
+
+def dismiss(session: Session, candidate_ids: Iterable[int]) -> int:
+    """Mark candidates as reviewed and not duplicates."""
+    result = session.execute(
+        update(DuplicateCandidate)
+        .where(DuplicateCandidate.id.in_(list(candidate_ids)))
+        .values(status="dismissed")
+    )
+    return int(result.rowcount)  # type: ignore[attr-defined]
+
+
+def merge(
+    session: Session,
+    *,
+    candidate_ids: Iterable[int] | None = None,
+    min_score: float | None = None,
+) -> int:
+    """Delete the newer row of pending candidates, keeping the older one.
+
+    Either the given *candidate_ids* or every pending pair scoring at least
+    *min_score* is merged; there is no default, since even identical payees
+    on nearby days can be two real purchases.  Pairs are taken oldest kept row first, and a pair
+    whose kept row is itself being deleted is skipped, so a chain never
+    loses all of its rows.  Returns the number of transactions deleted.
+    """
+    stmt = select(
+        DuplicateCandidate.transaction_id, DuplicateCandidate.duplicate_of_id
+    ).where(DuplicateCandidate.status == "pending")
+    if candidate_ids is not None:
+        stmt = stmt.where(DuplicateCandidate.id.in_(list(candidate_ids)))
+    elif min_score is None:
+        raise ValueError("merge needs candidate_ids or min_score")
+    else:
+        stmt = stmt.where(DuplicateCandidate.score >= min_score)
+    doomed: set[int] = set()
+    for tx, keep in session.execute(stmt.order_by(DuplicateCandidate.duplicate_of_id)):
+        if keep not in doomed:
+            doomed.add(tx)
+    if not doomed:
+        return 0
+    touched: set[rollups.Month] = set(
+        session.execute(
+            select(Transaction.account_id, Transaction.date).where(Transaction.id.in_(doomed))
+        ).tuples()
+    )
+    # Dependent rows are deleted explicitly, since SQLite only cascades with
+    # PRAGMA foreign_keys=ON.  A leftover transaction_raw row would otherwise
+    # be inherited by the next transaction that reuses the deleted rowid.
+    session.execute(
+        delete(DuplicateCandidate).where(
+            DuplicateCandidate.transaction_id.in_(doomed)
+            | DuplicateCandidate.duplicate_of_id.in_(doomed)
+        )
+    )
+    session.execute(delete(TransactionRaw).where(TransactionRaw.transaction_id.in_(doomed)))
+    session.execute(delete(Transaction).where(Transaction.id.in_(doomed)))
+    rollups.refresh_months(session, touched)
+    return len(doomed)
@@ -0,0 +1,240 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/services/fx.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Service: exchange rates and base-currency amounts.
+
+Rates live in ``exchange_rates`` as base-currency units per unit of a
+currency and day, loaded from CSV with :func:`load_rates_csv`.
+:func:`to_base` converts whole columns: each row takes the latest rate on or
+before its date (an as-of lookup via ``searchsorted``), at most
+:data:`MAX_RATE_AGE_DAYS` old so weekends and holidays are bridged but a
+stale table is not.  Rows of the base currency convert 1:1; rows without a
+usable rate stay ``None``.
+
+Ingest fills ``Transaction.amount_base_minor`` this way, so cross-currency
+totals are plain SQL sums (see ``rollups.monthly_totals(in_base=True)``);
+:func:`backfill` converts rows stored before their rates were loaded.
+"""
+from __future__ import annotations
+
+import csv
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from datetime import date
+from pathlib import Path
+from typing import Any, Final
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import ExchangeRate, Transaction
+from . import rollups
+
+MAX_RATE_AGE_DAYS: Final = 7
+RATE_CACHE_SIZE: Final = 32
+BACKFILL_BATCH: Final = 50_000
+
+Rates = tuple[np.ndarray, np.ndarray]  # (datetime64[D] days, float64 rates), sorted by day
+
+
+class RateCache:
+    """LRU of per-currency rate series.
+
+    Entries are keyed by a cheap per-currency fingerprint (row count, last
+    day, rate sum), so rates loaded by another process invalidate them
+    while unchanged currencies are never re-read.  The fingerprint misses
+    corrections that keep the sum (two swapped days), so
+    :func:`load_rates_csv` also drops the currencies it wrote
+    (:meth:`discard`).
+    """
+
+    def __init__(self, maxsize: int = RATE_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._entries: OrderedDict[tuple[Any, ...], Rates] = OrderedDict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def discard(self, session: Session, currencies: Iterable[str]) -> None:
+        """Forget the cached series of *currencies* in *session*'s database."""
+        url, codes = _url(session), set(currencies)
+        for key in [k for k in self._entries if k[0] == url and k[1] in codes]:
+            del self._entries[key]
+
+    def get(self, session: Session, currencies: Sequence[str]) -> dict[str, Rates]:
+        if not currencies:
+            return {}
+        url = _url(session)
+        stmt = (
+            select(
+                ExchangeRate.currency,
+                func.count(),
+                func.max(ExchangeRate.date),
+                func.sum(ExchangeRate.rate),
+            )
+            .where(ExchangeRate.currency.in_(currencies))
+            .group_by(ExchangeRate.currency)
+        )
+        found: dict[str, Rates] = {}
+        for currency, *fingerprint in session.execute(stmt):
+            key = (url, currency, *map(str, fingerprint))
+            rates = self._entries.get(key)
+            if rates is None:
+                self.misses += 1
+                rates = self._entries[key] = _read_series(session, currency)
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            found[currency] = rates
+        return found
+
+
+_cache = RateCache()
+
+
+def _url(session: Session) -> str:
+    return str(session.get_bind().engine.url)
+
+
+def rate_cache() -> RateCache:
+    return _cache
+
+
+def _read_series(session: Session, currency: str) -> Rates:
+    stmt = (
+        select(ExchangeRate.date, ExchangeRate.rate)
+        .where(ExchangeRate.currency == currency)
+        .order_by(ExchangeRate.date)
+    )
+    rows = session.execute(stmt).all()
+    days = pd.Series([d for d, _ in rows], dtype=object)
+    return _days(days), np.array([r for _, r in rows], dtype="float64")
+
+
+def _days(dates: pd.Series) -> np.ndarray:
+    """``datetime64[D]`` array from a series of dates or ISO strings."""
+    return pd.to_datetime(dates).to_numpy(dtype="datetime64[D]")
+
+
+def to_base(
+    session: Session,
+    dates: pd.Series,
+    currencies: pd.Series,
+    amount_minor: pd.Series,
+    *,
+    base: str | None = None,
+) -> pd.Series:
+    """*amount_minor* in base-currency minor units (object dtype, ``None`` if unknown)."""
+    base = base or get_settings().BASE_CURRENCY
+    codes = currencies.to_numpy(dtype=object)
+    amounts = amount_minor.to_numpy(dtype="float64")
+    days = _days(dates)
+    out = np.where(codes == base, amounts, np.nan)
+
+    foreign = [str(c) for c in pd.unique(codes[codes != base])]
+    max_age = np.timedelta64(MAX_RATE_AGE_DAYS, "D")
+    for currency, (rate_days, rates) in _cache.get(session, foreign).items():
+        rows = np.flatnonzero(codes == currency)
+        pos = np.searchsorted(rate_days, days[rows], side="right") - 1
+        usable = pos >= 0
+        usable[usable] = days[rows[usable]] - rate_days[pos[usable]] <= max_age
+        hit = rows[usable]
+        out[hit] = amounts[hit] * rates[pos[usable]]
+
+    # np.rint rounds half to even like models.to_minor
+    converted = pd.Series(np.rint(out), index=amount_minor.index).astype("Int64")
+    return converted.astype(object).where(converted.notna(), None)
+
+
+def load_rates_csv(session: Session, paths: Iterable[Path]) -> int:
+    """Store rates from CSV files with ``date,rate`` and optionally ``currency`` columns.
+
+    Without a ``currency`` column the file stem names it (``EUR.csv``).  A
+    file replaces every stored rate of its currencies between its first
+    and last date.  Returns the number of rates written.
+    """
+    written = 0
+    for path in paths:
+        with path.open(newline="", encoding="utf-8") as fh:
+            rows = [
+                {
+                    "currency": (r.get("currency") or path.stem).strip().upper(),
+                    "date": date.fromisoformat(r["date"].strip()),
+                    "rate": float(r["rate"].replace(",", ".")),
+                }
+                for r in csv.DictReader(fh)
+            ]
+        currencies = {str(r["currency"]) for r in rows}
+        for currency in currencies:
+            days = [r["date"] for r in rows if r["currency"] == currency]
+            session.execute(
+                delete(ExchangeRate).where(
+                    ExchangeRate.currency == currency,
+                    ExchangeRate.date.between(min(days), max(days)),
+                )
+            )
+        _cache.discard(session, currencies)
+        if rows:
+            # last value wins for a (currency, date) repeated within the file
+            unique = {(r["currency"], r["date"]): r for r in rows}
+            session.execute(insert(ExchangeRate), list(unique.values()))
+            written += len(unique)
+    return written
+
+
+def backfill(
+    session: Session, *, only_missing: bool = True, batch_size: int = BACKFILL_BATCH
+) -> int:
+    """Recompute ``amount_base_minor`` (by default only where it is NULL).
+
+    Rows are read in keyset batches of *batch_size* (``id > last id``) and
+    converted with :func:`to_base`; each batch's changed values are written
+    back with an executemany UPDATE before the next batch is read, so memory
+    stays bounded by the batch size.  The affected rollup months are
+    refreshed at the end.  Returns the number of rows updated.
+    """
+    stmt = (
+        select(
+            Transaction.id,
+            Transaction.account_id,
+            Transaction.date,
+            Transaction.currency,
+            Transaction.amount_minor,
+            Transaction.amount_base_minor,
+        )
+        .order_by(Transaction.id)
+        .limit(batch_size)
+    )
+    if only_missing:
+        stmt = stmt.where(Transaction.amount_base_minor.is_(None))
+    columns = ["id", "account_id", "date", "currency", "amount_minor", "amount_base_minor"]
+    updated, last_id = 0, 0
+    touched: set[rollups.Month] = set()
+    while rows := session.execute(stmt.where(Transaction.id > last_id)).all():
+        df = pd.DataFrame(rows, columns=columns)
+        last_id = int(df["id"].iloc[-1])
+        new = to_base(session, df["date"], df["currency"], df["amount_minor"])
+        old, cur = df["amount_base_minor"].astype("Int64"), new.astype("Int64")
+        changed = (cur.ne(old).fillna(True) & ~(cur.isna() & old.isna())).to_numpy(dtype=bool)
+        if changed.any():
+            session.execute(
+                update(Transaction),
+                [
+                    {"id": i, "amount_base_minor": v}
+                    for i, v in zip(df["id"][changed].tolist(), new[changed].tolist(), strict=True)
+                ],
+            )
+            updated += int(changed.sum())
+            touched.update(
+                zip(df["account_id"][changed].tolist(), df["date"][changed], strict=True)
+            )
+    if touched:
+        rollups.refresh_months(session, touched)
+    return updated
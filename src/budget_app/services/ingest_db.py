@@ -4,16 +4,36 @@
 """Service: insert a canonical DataFrame into the DB with dedup."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
+from collections.abc import Iterable, Sequence
 from datetime import date, datetime
-from typing import Any, Final, cast
+from typing import TYPE_CHECKING, Any, Final, Literal
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from ..models import Account, Transaction
+from ..config import RawStorage, get_settings
+from ..instrumentation import stage
+from ..models import (
+    MINOR_UNITS,
+    Account,
+    ImportBatch,
+    Transaction,
+    TransactionRaw,
+    insert_ignore,
+)
+from . import categorize, duplicates, fx, rollups, search
+
+if TYPE_CHECKING:  # the asyncio extension is slow to import and only used by the API
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 REQUIRED_COLS: Final = {"date", "payee", "amount", "currency", "account_id"}
+BULK_BATCH_SIZE: Final = 10_000
+# Stays below SQLite's historical 999 bound-parameter limit.
+LOOKUP_CHUNK_SIZE: Final = 900
 
 
 def _json_safe(value: Any) -> Any:
@@ -24,65 +44,390 @@ def _json_safe(value: Any) -> Any:
     return value
 
 
-def _coerce_date(value: Any) -> date:
-    """Coerce mixed date-like values into a `datetime.date`."""
-    if isinstance(value, pd.Timestamp):
-        return cast(date, value.date())
-    if isinstance(value, datetime):
-        return value.date()
-    if isinstance(value, date):
-        return value
-    if isinstance(value, str):
-        return datetime.fromisoformat(value).date()
-    # Fallback for numpy.datetime64 / other scalars:
-    ts = cast(pd.Timestamp, pd.to_datetime(value))
-    return cast(date, ts.date())
+def _raw_records(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """Build the ``raw`` payloads, converting date-like data one column at a time."""
+    out = df.copy()
+    for col in out.columns:
+        s = out[col]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            out[col] = _iso_strings(s, "s")
+        elif s.dtype == object and pd.api.types.infer_dtype(s) in {"date", "datetime"}:
+            out[col] = s.map(_json_safe)
+    return _records(out)
+
+
+def _records(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """Row dicts via per-column ``tolist()``; much faster than ``to_dict("records")``."""
+    cols = [str(c) for c in df.columns]
+    columns = [df[c].tolist() for c in cols]
+    return [dict(zip(cols, row, strict=True)) for row in zip(*columns, strict=True)]
+
+
+def _iso_strings(s: pd.Series, unit: Literal["D", "s"]) -> pd.Series:
+    """ISO-format a datetime column via numpy (an order of magnitude faster than strftime)."""
+    values = np.datetime_as_string(s.to_numpy(dtype=f"datetime64[{unit}]"), unit=unit)
+    return pd.Series(values, index=s.index, dtype=object)
+
+
+def _hash_column(keys: pd.Series) -> list[str]:
+    """SHA-256 every key in one pass (keys are pre-joined ``a|b|c`` strings)."""
+    sha256 = hashlib.sha256
+    return [sha256(k.encode()).hexdigest() for k in keys.tolist()]
+
+
+def _prepare(df: pd.DataFrame, *, with_raw: bool = True) -> pd.DataFrame:
+    """Normalise *df* column-wise and add ``tx_hash`` and ``raw`` columns.
+
+    ``with_raw=False`` leaves ``raw`` empty and skips building the payloads.
+
+    The hash key is built by vectorised string concatenation in the exact
+    ``account|date|payee|amount|currency`` layout of
+    :py:meth:`Transaction.calc_hash` (amount rounded to minor units), so
+    hashes match rows written by it.
+    """
+    dates = pd.to_datetime(df["date"], format="ISO8601")
+    amount = df["amount"].astype(float)
+    if amount.isna().any():
+        raise ValueError("DataFrame has missing or non-numeric amounts")
+    # np.rint rounds half to even like round() in models.to_minor
+    amount_minor = np.rint(amount * MINOR_UNITS).astype("int64")
+    out = pd.DataFrame(
+        {
+            "account_id": df["account_id"].astype(str),
+            "date": dates.dt.date,
+            "payee": df["payee"].astype(str),
+            "amount_minor": amount_minor,
+            "currency": df["currency"].astype(str),
+        },
+        index=df.index,
+    )
+    # float64 → str uses the shortest round-trip repr, same as f"{float}"
+    amount_key = (amount_minor / MINOR_UNITS).astype(str)
+    keys = (
+        out["account_id"]
+        + "|"
+        + _iso_strings(dates, "D")
+        + "|"
+        + out["payee"]
+        + "|"
+        + amount_key
+        + "|"
+        + out["currency"]
+    )
+    out["tx_hash"] = _hash_column(keys)
+    raw = _raw_records(df) if with_raw else [None] * len(df)
+    out["raw"] = pd.Series(raw, index=out.index, dtype=object)
+    return out
+
 
+def add_transactions(
+    session: Session,
+    df: pd.DataFrame,
+    *,
+    bulk: bool = False,
+    scoped: bool = False,
+    raw_storage: RawStorage | None = None,
+    update_rollups: bool = True,
+    detect_duplicates: bool = True,
+    source: str | None = None,
+    batch_id: int | None = None,
+) -> int:
+    """Insert *df* into *session*, skipping rows whose hash already exists.
 
-def add_transactions(session: Session, df: pd.DataFrame) -> int:  # noqa: D401
-    """Insert *df* into *session*, skipping rows whose hash already exists."""
+    With ``bulk=True`` rows are written through core ``INSERT … ON CONFLICT
+    DO NOTHING`` statements instead of ORM objects; see :func:`_add_bulk`.
+
+    The dedup lookup only asks about hashes present in *df*.  ``scoped=True``
+    instead reads the (account, date range) slice covered by *df*, which is
+    cheaper for e.g. a monthly import of one account.  The bulk path does no
+    lookup at all, so combining ``scoped=True`` with ``bulk=True`` raises
+    ``ValueError``.
+
+    *raw_storage* overrides ``Settings.RAW_STORAGE`` for where the input
+    record is kept: inline JSON, the compressed ``transaction_raw`` side
+    table, or not at all.
+
+    Every row is categorised from the stored ``category_rules`` and gets its
+    base-currency amount from the stored exchange rates (see
+    :func:`fx.to_base`), and new payees are added to the payee search index.
+
+    With *update_rollups* the ``monthly_totals`` rows of every (account,
+    month) that received new rows are recomputed; see
+    :func:`rollups.refresh_months`.
+
+    The rows are recorded as one :class:`ImportBatch` of the feed *source*
+    (e.g. the ingestor that parsed them, not the file), or join the existing batch *batch_id* (see
+    :func:`add_transaction_chunks`).  With *detect_duplicates* the inserted
+    rows are checked for near-duplicates from other sources; see
+    :func:`duplicates.find_candidates`.  Rows without a *source* are never
+    paired.
+    """
+    raw_storage = _checked(df, raw_storage, bulk=bulk, scoped=scoped)
+    with stage("add_transactions") as st:
+        with stage("add_transactions.prepare"):
+            prepared = _prepare(df, with_raw=raw_storage != "none")
+        with stage("add_transactions.categorize"):
+            prepared["category"] = _categories(categorize.categorizer(session), prepared)
+        inserted = _add_prepared(
+            session,
+            df,
+            prepared,
+            bulk=bulk,
+            scoped=scoped,
+            side_raw=raw_storage == "side",
+            update_rollups=update_rollups,
+            detect_duplicates=detect_duplicates,
+            batch_id=batch_id if batch_id is not None else new_batch(session, source),
+        )
+        st.rows(rows_in=len(df), rows_out=inserted, duplicates=len(df) - inserted)
+    return inserted
+
+
+def new_batch(session: Session, source: str | None = None) -> int:
+    """Record a new :class:`ImportBatch` and return its id."""
+    stmt = insert(ImportBatch).values(source=source).returning(ImportBatch.id)
+    return int(session.execute(stmt).scalar_one())
+
+
+def _checked(
+    df: pd.DataFrame, raw_storage: RawStorage | None, *, bulk: bool, scoped: bool
+) -> RawStorage:
+    """Validate *df*'s columns and the options, and resolve the raw storage mode."""
     missing = REQUIRED_COLS - set(df.columns)
     if missing:
         raise ValueError(f"DataFrame missing required columns: {missing}")
+    if bulk and scoped:
+        raise ValueError("scoped=True has no effect with bulk=True, which dedups in the INSERT")
+    return raw_storage or get_settings().RAW_STORAGE
+
 
-    session.flush()  # make unflushed inserts visible to our SELECT
-
-    existing_hashes: set[str] = {h for (h,) in session.execute(select(Transaction.tx_hash))}
-    new_rows: list[Transaction] = []
-
-    # Iterate with well-typed dicts instead of itertuples() to avoid giant unions
-    for rec in df.to_dict(orient="records"):
-        account_id = str(rec["account_id"])
-        date_obj = _coerce_date(rec["date"])
-        date_iso = date_obj.isoformat()
-        payee = str(rec["payee"])
-        amount = float(rec["amount"])
-        currency = str(rec["currency"])
-
-        tx_hash = Transaction.calc_hash(account_id, date_iso, payee, amount, currency)
-        if tx_hash in existing_hashes:
-            continue
-        existing_hashes.add(tx_hash)
-
-        account = Account.get_or_create(
-            session=session,
-            account_id=account_id,
-            currency=currency,
+def _categories(matcher: categorize.Categorizer, prepared: pd.DataFrame) -> pd.Series | None:
+    return matcher.categorize_series(prepared["payee"]) if len(matcher) else None
+
+
+def _add_prepared(
+    session: Session,
+    df: pd.DataFrame,
+    prepared: pd.DataFrame,
+    *,
+    bulk: bool,
+    scoped: bool,
+    side_raw: bool,
+    update_rollups: bool,
+    detect_duplicates: bool,
+    batch_id: int,
+) -> int:
+    """DB part of :func:`add_transactions` for a prepared, categorised frame."""
+    prepared["batch_id"] = batch_id
+    with stage("add_transactions.fx"):
+        prepared["amount_base_minor"] = fx.to_base(
+            session, prepared["date"], prepared["currency"], prepared["amount_minor"]
         )
+    if bulk:
+        with stage("add_transactions.write"):
+            new_ids, touched = _add_bulk(session, prepared, side_raw=side_raw)
+    else:
+        new_ids, touched = _add_orm(session, df, prepared, scoped=scoped, side_raw=side_raw)
+    if new_ids:
+        with stage("add_transactions.search_index"):
+            search.index_payees(session, prepared["payee"].unique().tolist())
+    if update_rollups and touched:
+        with stage("add_transactions.rollups"):
+            rollups.refresh_months(session, touched)
+    if detect_duplicates and new_ids:
+        with stage("add_transactions.duplicates"):
+            duplicates.find_candidates(session, new_ids)
+    return len(new_ids)
+
 
-        clean_raw = {k: _json_safe(v) for k, v in rec.items()}
+def _add_orm(
+    session: Session,
+    df: pd.DataFrame,
+    prepared: pd.DataFrame,
+    *,
+    scoped: bool,
+    side_raw: bool,
+) -> tuple[list[int], set[rollups.Month]]:
+    """ORM path of :func:`add_transactions`: look up existing hashes, add the rest."""
+    with stage("add_transactions.dedup"):
+        session.flush()  # make unflushed inserts visible to our SELECT
+        if scoped:
+            existing_hashes = _existing_hashes_in_scope(session, df)
+        else:
+            existing_hashes = _existing_hashes(session, prepared["tx_hash"].tolist())
+        fresh = prepared[~prepared["tx_hash"].isin(existing_hashes)].drop_duplicates("tx_hash")
 
-        new_rows.append(
+    with stage("add_transactions.write"):
+        # autoflush is off, so get_or_create cannot see accounts added earlier in
+        # this call; resolve each account once up front instead.
+        first_currency = fresh.groupby("account_id", sort=False)["currency"].first()
+        accounts = {
+            str(name): Account.get_or_create(
+                session=session, account_id=str(name), currency=str(currency)
+            )
+            for name, currency in first_currency.items()
+        }
+
+        # Iterate with well-typed dicts instead of itertuples() to avoid giant unions
+        new_rows = [
             Transaction(
-                account=account,
-                date=date_obj,
-                payee=payee,
-                amount=amount,
-                currency=currency,
-                tx_hash=tx_hash,
-                raw=clean_raw,
+                account=accounts[rec["account_id"]],
+                date=rec["date"],
+                payee=rec["payee"],
+                amount_minor=rec["amount_minor"],
+                currency=rec["currency"],
+                amount_base_minor=rec["amount_base_minor"],
+                tx_hash=rec["tx_hash"],
+                batch_id=rec["batch_id"],
+                category=rec["category"],
+                raw=None if side_raw else rec["raw"],
+                raw_record=(
+                    TransactionRaw(payload=TransactionRaw.pack(rec["raw"])) if side_raw else None
+                ),
             )
+            for rec in _records(fresh)
+        ]
+        session.add_all(new_rows)
+        session.flush()  # assigns account ids to the new accounts
+    return [t.id for t in new_rows], {(t.account_id, t.date) for t in new_rows}
+
+
+async def add_transactions_async(
+    session: AsyncSession,
+    df: pd.DataFrame,
+    *,
+    bulk: bool = False,
+    scoped: bool = False,
+    raw_storage: RawStorage | None = None,
+    update_rollups: bool = True,
+    detect_duplicates: bool = True,
+    source: str | None = None,
+    batch_id: int | None = None,
+) -> int:
+    """:func:`add_transactions` on an :class:`AsyncSession`.
+
+    The CPU-bound steps (normalising, hashing and categorising the frame)
+    run in a worker thread via :func:`asyncio.to_thread`; the DB round-trips
+    then go through ``run_sync``, so neither blocks the event loop for long.
+    """
+    raw_storage = _checked(df, raw_storage, bulk=bulk, scoped=scoped)
+    with stage("add_transactions") as st:
+        with stage("add_transactions.prepare"):
+            prepared = await asyncio.to_thread(_prepare, df, with_raw=raw_storage != "none")
+        with stage("add_transactions.categorize"):
+            matcher = await session.run_sync(categorize.categorizer)
+            prepared["category"] = await asyncio.to_thread(_categories, matcher, prepared)
+        if batch_id is None:
+            batch_id = await session.run_sync(new_batch, source)
+        inserted = await session.run_sync(
+            _add_prepared,
+            df,
+            prepared,
+            bulk=bulk,
+            scoped=scoped,
+            side_raw=raw_storage == "side",
+            update_rollups=update_rollups,
+            detect_duplicates=detect_duplicates,
+            batch_id=batch_id,
+        )
+        st.rows(rows_in=len(df), rows_out=inserted, duplicates=len(df) - inserted)
+    return inserted
+
+
+def add_transaction_chunks(
+    session: Session,
+    chunks: Iterable[pd.DataFrame],
+    *,
+    bulk: bool = False,
+    source: str | None = None,
+) -> int:
+    """Feed each chunk (e.g. from ``BankIngestor.iter_chunks``) to :func:`add_transactions`.
+
+    The session is committed after every chunk, so peak memory follows the
+    chunk size rather than the file size, and an interrupted run keeps the
+    chunks it already wrote.  All chunks share one import batch, so rows of
+    the same file are never paired as near-duplicates across chunks.
+    """
+    batch_id = new_batch(session, source)
+    inserted = 0
+    for chunk in chunks:
+        inserted += add_transactions(session, chunk, bulk=bulk, batch_id=batch_id)
+        session.commit()
+    return inserted
+
+
+def _existing_hashes(session: Session, hashes: Sequence[str]) -> set[str]:
+    """Return the subset of *hashes* already stored, using chunked ``IN`` lookups."""
+    found: set[str] = set()
+    unique = list(dict.fromkeys(hashes))
+    for start in range(0, len(unique), LOOKUP_CHUNK_SIZE):
+        chunk = unique[start : start + LOOKUP_CHUNK_SIZE]
+        stmt = select(Transaction.tx_hash).where(Transaction.tx_hash.in_(chunk))
+        found.update(session.scalars(stmt))
+    return found
+
+
+def _existing_hashes_in_scope(session: Session, df: pd.DataFrame) -> set[str]:
+    """Return stored hashes for the accounts and date range covered by *df*.
+
+    A row's hash embeds its account and date, so any stored duplicate must
+    live inside this slice.
+    """
+    if df.empty:
+        return set()
+    dates = pd.to_datetime(df["date"])
+    names = [str(a) for a in df["account_id"].unique()]
+    stmt = (
+        select(Transaction.tx_hash)
+        .join(Account)
+        .where(
+            Account.name.in_(names),
+            Transaction.date.between(dates.min().date(), dates.max().date()),
         )
+    )
+    return set(session.scalars(stmt))
 
-    session.add_all(new_rows)
-    return len(new_rows)
+
+def _add_bulk(
+    session: Session, df: pd.DataFrame, *, side_raw: bool = False
+) -> tuple[list[int], set[rollups.Month]]:
+    """Bulk path for a :func:`_prepare`-d frame: one account lookup per batch.
+
+    Deduplication is delegated to the unique constraint on ``tx_hash``; the
+    returned ids and ``(account_id, month)`` set come from ``RETURNING`` so
+    they only cover rows that were actually written.  With *side_raw* the
+    payloads of exactly those rows go to ``transaction_raw``.
+    """
+    session.flush()  # push pending ORM objects before issuing core statements
+
+    new_ids: list[int] = []
+    touched: set[rollups.Month] = set()
+    tx_table = Transaction.__table__
+    stmt = insert_ignore(session, Transaction, "tx_hash").returning(
+        tx_table.c.id, tx_table.c.tx_hash
+    )
+    for start in range(0, len(df), BULK_BATCH_SIZE):
+        batch = df.iloc[start : start + BULK_BATCH_SIZE]
+        first_currency = batch.groupby("account_id", sort=False)["currency"].first()
+        account_ids = Account.resolve_ids(
+            session=session, accounts={str(k): str(v) for k, v in first_currency.items()}
+        )
+        rows = batch.assign(account_id=batch["account_id"].map(account_ids))
+        if side_raw:
+            rows = rows.assign(raw=None)
+        written = session.execute(stmt, _records(rows)).all()
+        new_ids += [pk for pk, _ in written]
+        if written:
+            new = rows[rows["tx_hash"].isin([h for _, h in written])]
+            months = new["date"].map(rollups.first_of_month)
+            touched.update(zip(new["account_id"].tolist(), months.tolist(), strict=True))
+        if side_raw and written:
+            raw_by_hash = dict(zip(batch["tx_hash"], batch["raw"], strict=True))
+            session.execute(
+                insert(TransactionRaw),
+                [
+                    {"transaction_id": pk, "payload": TransactionRaw.pack(raw_by_hash[h])}
+                    for pk, h in written
+                ],
+            )
+    return new_ids, touched
@@ -0,0 +1,134 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/services/manifest.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Service: track ingested files so unchanged ones are skipped on re-runs."""
+from __future__ import annotations
+
+import hashlib
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Final, Literal, NamedTuple
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import IngestManifest
+
+READ_BLOCK: Final = 1 << 20
+LOOKUP_CHUNK_SIZE: Final = 900
+
+
+class Change(NamedTuple):
+    """How a file differs from its manifest entry."""
+
+    kind: Literal["new", "unchanged", "appended", "rewritten"]
+    digest: str
+    offset: int = 0  # bytes already ingested; only non-zero for "appended"
+
+
+def manifest_key(path: Path) -> str:
+    return str(path.resolve())
+
+
+def manifest_entries(session: Session, paths: Iterable[Path]) -> dict[str, IngestManifest]:
+    """Load manifest rows for *paths* in a few chunked lookups."""
+    keys = [manifest_key(p) for p in paths]
+    found: dict[str, IngestManifest] = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        stmt = select(IngestManifest).where(
+            IngestManifest.path.in_(keys[start : start + LOOKUP_CHUNK_SIZE])
+        )
+        found.update((m.path, m) for m in session.scalars(stmt))
+    return found
+
+
+def is_unchanged(entry: IngestManifest, path: Path) -> bool:
+    """O(1) check: same size and mtime as when the file was ingested."""
+    st = path.stat()
+    return entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns
+
+
+def classify(path: Path, previous: tuple[int, str] | None) -> Change:
+    """Digest *path* and compare it with the previous ``(size, digest)``.
+
+    A file counts as *appended* when its first ``size`` bytes still hash to
+    the old digest and that prefix ended on a line break, so the new tail
+    can be parsed on its own.
+    """
+    full = hashlib.sha256()
+    prefix_digest: str | None = None
+    last_prefix_byte = b""
+    remaining = previous[0] if previous else -1
+    with path.open("rb") as fh:
+        while block := fh.read(READ_BLOCK):
+            if 0 < remaining < len(block):
+                full.update(block[:remaining])
+                prefix_digest = full.hexdigest()
+                last_prefix_byte = block[remaining - 1 : remaining]
+                full.update(block[remaining:])
+            else:
+                full.update(block)
+                if remaining == len(block):
+                    last_prefix_byte = block[-1:]
+            remaining -= len(block)
+            if remaining == 0:
+                prefix_digest = full.hexdigest()
+    digest = full.hexdigest()
+
+    if previous is None:
+        return Change("new", digest)
+    old_size, old_digest = previous
+    if digest == old_digest:
+        return Change("unchanged", digest)
+    if prefix_digest == old_digest and last_prefix_byte == b"\n":
+        return Change("appended", digest, old_size)
+    return Change("rewritten", digest)
+
+
+@contextmanager
+def tail_file(path: Path, offset: int) -> Iterator[Path]:
+    """Yield a temp copy of *path* holding its header line plus bytes from *offset*.
+
+    The copy keeps the original file name, since some ingestors derive the
+    account from it.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        tail = Path(tmp) / path.name
+        with path.open("rb") as src, tail.open("wb") as dst:
+            dst.write(src.readline())
+            src.seek(offset)
+            shutil.copyfileobj(src, dst)
+        yield tail
+
+
+def record(
+    session: Session,
+    path: Path,
+    change: Change,
+    *,
+    ingestor: str,
+    df: pd.DataFrame | None,
+    entry: IngestManifest | None,
+) -> IngestManifest:
+    """Create or update the manifest row for *path* after a successful load."""
+    st = path.stat()
+    if entry is None:
+        entry = IngestManifest(path=manifest_key(path), row_count=0)
+        session.add(entry)
+    if change.kind in ("new", "rewritten"):
+        entry.row_count, entry.date_min, entry.date_max = 0, None, None
+    if df is not None and not df.empty:
+        dates = pd.to_datetime(df["date"])
+        lo, hi = dates.min().date(), dates.max().date()
+        entry.row_count += len(df)
+        entry.date_min = lo if entry.date_min is None else min(entry.date_min, lo)
+        entry.date_max = hi if entry.date_max is None else max(entry.date_max, hi)
+    entry.size, entry.mtime_ns, entry.digest = st.st_size, st.st_mtime_ns, change.digest
+    entry.ingestor = ingestor
+    entry.ingested_at = datetime.now()
+    return entry
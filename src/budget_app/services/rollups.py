@@ -0,0 +1,146 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/services/rollups.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Service: maintain and query the ``monthly_totals`` rollup table."""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import Any
+
+import pandas as pd
+from sqlalchemy import Date, and_, case, cast, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from ..models import MINOR_UNITS, Account, MonthlyTotal, Transaction
+
+Month = tuple[int, date]  # (account id, first day of month)
+
+
+def first_of_month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def month_expr(session: Session) -> ColumnElement[Any]:
+    """SQL for the first day of ``Transaction.date``'s month in the bound dialect."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return func.date(Transaction.date, "start of month")
+    if dialect == "postgresql":
+        return cast(func.date_trunc("month", Transaction.date), Date)
+    raise NotImplementedError(f"grouping by month is not supported on {dialect!r}")
+
+
+def _refill(session: Session, where: ColumnElement[bool] | None) -> None:
+    month = month_expr(session)
+    source = select(
+        Transaction.account_id,
+        month,
+        Transaction.payee,
+        func.sum(Transaction.amount_minor),
+        # NULL unless every row has a base amount, so a total is never partial
+        case(
+            (
+                func.count(Transaction.amount_base_minor) == func.count(),
+                func.sum(Transaction.amount_base_minor),
+            ),
+        ),
+        func.count(),
+    ).group_by(Transaction.account_id, month, Transaction.payee)
+    if where is not None:
+        source = source.where(where)
+    session.execute(
+        insert(MonthlyTotal).from_select(
+            ["account_id", "month", "payee", "total_minor", "total_base_minor", "tx_count"],
+            source,
+        )
+    )
+
+
+def refresh_months(session: Session, touched: Iterable[Month]) -> int:
+    """Recompute the rollup rows of each touched ``(account_id, month)``.
+
+    Only transactions inside those months are re-aggregated (an index range
+    on ``(account_id, date)`` each), so the cost follows the size of the
+    import rather than of the table.  Returns the number of months refreshed.
+    """
+    by_account: dict[int, set[date]] = defaultdict(set)
+    for account_id, day in touched:
+        by_account[account_id].add(first_of_month(day))
+
+    session.flush()  # the aggregate must see rows still pending in the session
+    for account_id, months in by_account.items():
+        session.execute(
+            delete(MonthlyTotal).where(
+                MonthlyTotal.account_id == account_id, MonthlyTotal.month.in_(months)
+            )
+        )
+        ranges = [
+            Transaction.date.between(m, next_month(m) - timedelta(days=1))
+            for m in sorted(months)
+        ]
+        _refill(session, and_(Transaction.account_id == account_id, or_(*ranges)))
+    return sum(len(m) for m in by_account.values())
+
+
+def rebuild(session: Session) -> int:
+    """Drop and recompute every rollup row (backfills, or after manual edits)."""
+    session.flush()
+    session.execute(delete(MonthlyTotal))
+    _refill(session, None)
+    return session.scalar(select(func.count()).select_from(MonthlyTotal)) or 0
+
+
+def monthly_totals(
+    session: Session,
+    *,
+    account: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    by_payee: bool = False,
+    in_base: bool = False,
+) -> pd.DataFrame:
+    """Totals per account and month (and payee with *by_payee*) from the rollup.
+
+    Reads one row per (account, month[, payee]) instead of scanning
+    ``transactions``.  *date_from*/*date_to* select whole months.  With
+    *in_base* the totals are in ``Settings.BASE_CURRENCY``, and rows are
+    keyed by month only, so accounts in different currencies add up; a
+    month with unconverted transactions has a missing (NaN) total.
+    """
+    keys: list[Any] = [MonthlyTotal.month]
+    if not in_base:
+        keys.insert(0, Account.name.label("account"))
+    if by_payee:
+        keys.append(MonthlyTotal.payee)
+    total = MonthlyTotal.total_base_minor if in_base else MonthlyTotal.total_minor
+    # as in _refill, a group with any NULL total has no total
+    summed = case((func.count(total) == func.count(), func.sum(total)))
+    stmt = (
+        select(
+            *keys,
+            summed.label("total_minor"),
+            func.sum(MonthlyTotal.tx_count).label("count"),
+        )
+        .join(Account, MonthlyTotal.account_id == Account.id)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+    if account is not None:
+        stmt = stmt.where(Account.name == account)
+    if date_from is not None:
+        stmt = stmt.where(MonthlyTotal.month >= first_of_month(date_from))
+    if date_to is not None:
+        stmt = stmt.where(MonthlyTotal.month <= date_to)
+
+    rows = session.execute(stmt).all()
+    columns = [*(k.key for k in keys), "total_minor", "count"]
+    df = pd.DataFrame(rows, columns=columns)
+    df["total"] = df.pop("total_minor").astype("float64") / MINOR_UNITS
+    return df
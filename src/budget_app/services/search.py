@@ -0,0 +1,128 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/services/search.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Service: indexed payee search.
+
+Queries run against ``payee_names`` (each distinct payee once) rather than
+``transactions``, so their cost follows the number of distinct payees, not
+the row count.  Transaction searches then expand to ``payee IN (…)`` over
+the ``(payee, date)`` index.
+
+Query syntax: words are AND-ed, ``OR`` or ``|`` separates alternatives, so
+``"ica OR spotify"`` finds both.  With *prefix* (the default) every word
+also matches longer words, ``"spot"`` finding ``"SPOTIFY AB"``.  Matching is
+case-insensitive; SQLite also ignores diacritics.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from ..models import PayeeName, Transaction, insert_ignore
+
+# SQLite FTS5 index over payee_names (rowid = payee_names.id); see models.PAYEE_SEARCH_DDL
+_fts = table("payee_fts", column("rowid"), column("rank"))
+_ALTERNATIVES = re.compile(r"\s+OR\s+|\|")
+_WORD = re.compile(r"\w+")
+
+
+def parse(query: str) -> list[list[str]]:
+    """Split *query* into OR-ed alternatives of AND-ed words."""
+    alternatives = [_WORD.findall(part) for part in _ALTERNATIVES.split(query)]
+    found = [words for words in alternatives if words]
+    if not found:
+        raise ValueError(f"Search query {query!r} contains no words")
+    return found
+
+
+def _fts5_query(alternatives: list[list[str]], prefix: bool) -> str:
+    star = "*" if prefix else ""
+    # words are \\w+ only, so double quotes cannot appear inside them
+    return " OR ".join(
+        "(" + " ".join(f'"{word}"{star}' for word in words) + ")" for words in alternatives
+    )
+
+
+def payee_matches(dialect: str, query: str, *, prefix: bool = True) -> Select[Any]:
+    """``(payee, score)`` for payees matching *query*, best first.
+
+    Scores are only comparable within one dialect: negated BM25 on SQLite,
+    ``word_similarity`` on PostgreSQL.
+    """
+    alternatives = parse(query)
+    if dialect == "sqlite":
+        rank = _fts.c.rank  # BM25, lower is better
+        return (
+            select(PayeeName.name, (-rank).label("score"))
+            .join_from(_fts, PayeeName, PayeeName.id == _fts.c.rowid)
+            .where(literal_column("payee_fts").op("MATCH")(_fts5_query(alternatives, prefix)))
+            .order_by(rank, PayeeName.id)
+        )
+    if dialect == "postgresql":
+        end = "" if prefix else r"\M"
+        matched = or_(
+            *(
+                and_(*(PayeeName.name.op("~*")(rf"\m{word}{end}") for word in words))
+                for words in alternatives
+            )
+        )
+        score = func.word_similarity(" ".join(w for ws in alternatives for w in ws), PayeeName.name)
+        return (
+            select(PayeeName.name, score.label("score"))
+            .where(matched)
+            .order_by(score.desc(), PayeeName.id)
+        )
+    raise NotImplementedError(f"payee search is not supported on {dialect!r}")
+
+
+def payee_filter(dialect: str, query: str, *, prefix: bool = True) -> ColumnElement[bool]:
+    """``Transaction.payee IN (…)`` over every payee matching *query*.
+
+    A semi-join without a cap: common words match thousands of payees (SEB
+    payees embed dates and references), and the caller's keyset paging
+    already bounds the rows read.
+    """
+    matches = payee_matches(dialect, query, prefix=prefix)
+    return Transaction.payee.in_(matches.with_only_columns(PayeeName.name).order_by(None))
+
+
+def search_payees(
+    session: Session, query: str, *, prefix: bool = True, limit: int = 20, offset: int = 0
+) -> list[tuple[str, float]]:
+    """One page of ranked ``(payee, score)`` matches."""
+    stmt = payee_matches(session.get_bind().dialect.name, query, prefix=prefix)
+    rows = session.execute(stmt.limit(limit).offset(offset))
+    return [(name, float(score)) for name, score in rows]
+
+
+def index_payees(session: Session, payees: Iterable[str]) -> None:
+    """Add payees not yet in ``payee_names``; the search index follows via triggers."""
+    rows = [{"name": name} for name in dict.fromkeys(payees)]
+    if rows:
+        session.execute(insert_ignore(session, PayeeName, "name"), rows)
+
+
+def rebuild_index(session: Session) -> int:
+    """Re-derive ``payee_names`` and its search index from ``transactions``."""
+    session.execute(delete(PayeeName))
+    session.execute(insert(PayeeName).from_select(["name"], select(Transaction.payee).distinct()))
+    if session.get_bind().dialect.name == "sqlite":
+        session.execute(text("INSERT INTO payee_fts (payee_fts) VALUES ('rebuild')"))
+    return int(session.scalar(select(func.count()).select_from(PayeeName)) or 0)
@@ -0,0 +1,263 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# src/budget_app/services/snapshots.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Service: partitioned Parquet snapshots of the transactions table.
+
+:func:`export_parquet` writes one file per ``account=<name>/month=<YYYY-MM>``
+directory (Hive layout) holding that month's transactions joined with their
+account.  ``_manifest.json`` in the snapshot root keeps a fingerprint per
+partition (row count, id sum, max id, amount sums) plus a digest of the
+category rules; a later export rewrites only partitions whose fingerprint
+changed and deletes those that no longer exist.  A rules change rewrites
+everything, since ``recategorize`` may have touched any row.
+
+:func:`read_table` and :func:`read_frame` scan a snapshot through
+memory-mapped files, reading only the requested columns and only the
+partitions that can match the account and date filters.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import operator
+import os
+import shutil
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import reduce
+from pathlib import Path
+from typing import Any, Final
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+from sqlalchemy import String, func, or_, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..instrumentation import stage
+from ..models import Account, Transaction
+from .categorize import load_rules
+from .rollups import month_expr, next_month
+
+MANIFEST: Final = "_manifest.json"  # "_" and "." files are skipped by dataset scans
+PART_FILE: Final = "part-0.parquet"
+COMPRESSION: Final = "zstd"
+SCHEMA: Final = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("date", pa.date32()),
+        ("payee", pa.string()),
+        ("amount_minor", pa.int64()),
+        ("currency", pa.string()),
+        ("amount_base_minor", pa.int64()),
+        ("category", pa.string()),
+        ("account_currency", pa.string()),
+        ("institution", pa.string()),
+    ]
+)
+PARTITION_SCHEMA: Final = pa.schema([("account", pa.string()), ("month", pa.string())])
+
+Partition = tuple[str, str]  # (account name, "YYYY-MM")
+
+
+@dataclass(slots=True)
+class ExportResult:
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    rows: int = 0
+
+
+def partition_path(root: Path, account: str, month: str) -> Path:
+    # the reader URI-decodes Hive segments, so any account name round-trips
+    return root / f"account={quote(account, safe='')}" / f"month={month}"
+
+
+def _key(partition: Partition) -> str:
+    return "/".join(partition)
+
+
+def _rules_digest(session: Session) -> str:
+    return hashlib.sha256(repr(load_rules(session)).encode()).hexdigest()
+
+
+def _fingerprints(session: Session) -> dict[Partition, tuple[int, list[int]]]:
+    """``(account, month) → (account id, fingerprint)`` from one GROUP BY."""
+    month = month_expr(session)
+    stmt = (
+        select(
+            Account.id,
+            Account.name,
+            month,
+            func.count(),
+            func.sum(Transaction.id),
+            func.max(Transaction.id),
+            func.sum(Transaction.amount_minor),
+            # fx.backfill fills base amounts in without touching anything else
+            func.count(Transaction.amount_base_minor),
+            func.coalesce(func.sum(Transaction.amount_base_minor), 0),
+        )
+        .join(Account, Transaction.account_id == Account.id)
+        .group_by(Account.id, Account.name, month)
+    )
+    return {
+        (name, str(m)[:7]): (account_id, [int(v) for v in values])
+        for account_id, name, m, *values in session.execute(stmt)
+    }
+
+
+def _read_rows(session: Session, account_id: int, months: Iterable[str] | None) -> pd.DataFrame:
+    """Rows of one account, limited to *months* unless that is ``None`` (all)."""
+    stmt = (
+        select(
+            Transaction.id,
+            # ISO text as stored: pandas parses it vectorised, skipping the per-row Date type
+            type_coerce(Transaction.date, String).label("date"),
+            Transaction.payee,
+            Transaction.amount_minor,
+            Transaction.currency,
+            Transaction.amount_base_minor,
+            Transaction.category,
+            Account.currency.label("account_currency"),
+            Account.institution,
+        )
+        .join(Account, Transaction.account_id == Account.id)
+        .where(Transaction.account_id == account_id)
+        .order_by(Transaction.date)  # (account_id, date) index order; ties stay in id order
+    )
+    if months is not None:
+        firsts = [date.fromisoformat(f"{m}-01") for m in sorted(months)]
+        stmt = stmt.where(
+            or_(*(Transaction.date.between(m, next_month(m) - timedelta(days=1)) for m in firsts))
+        )
+    return pd.read_sql(stmt, session.connection())
+
+
+def _write_partition(directory: Path, frame: pd.DataFrame) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(frame, schema=SCHEMA, preserve_index=False)
+    tmp = directory / f".{PART_FILE}.tmp"
+    pq.write_table(table, tmp, compression=COMPRESSION)
+    os.replace(tmp, directory / PART_FILE)  # readers never see a half-written file
+
+
+def _remove_partition(root: Path, account: str, month: str) -> None:
+    directory = partition_path(root, account, month)
+    shutil.rmtree(directory, ignore_errors=True)
+    if directory.parent.is_dir() and not any(directory.parent.iterdir()):
+        directory.parent.rmdir()
+
+
+def _read_manifest(root: Path) -> dict[str, Any]:
+    try:
+        manifest: dict[str, Any] = json.loads((root / MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    return manifest
+
+
+def _write_manifest(root: Path, manifest: dict[str, Any]) -> None:
+    tmp = root / f".{MANIFEST}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, root / MANIFEST)
+
+
+def export_parquet(session: Session, root: Path, *, full: bool = False) -> ExportResult:
+    """Bring the snapshot under *root* up to date; ``full`` rewrites every partition.
+
+    Run it inside one transaction (e.g. ``session_scope(write=False)``) so
+    the fingerprints and the rows come from the same database snapshot.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(root)
+    rules = _rules_digest(session)
+    known: dict[str, list[int]] = manifest.get("partitions", {})
+    previous = known if not full and manifest.get("rules") == rules else {}
+    result = ExportResult()
+    with stage("export_parquet") as st:
+        current = _fingerprints(session)
+        names: dict[int, str] = {}
+        months_of: dict[int, set[str]] = defaultdict(set)
+        stale: dict[int, set[str]] = defaultdict(set)
+        for (account, month), (account_id, fingerprint) in current.items():
+            names[account_id] = account
+            months_of[account_id].add(month)
+            if previous.get(_key((account, month))) == fingerprint:
+                result.unchanged += 1
+            else:
+                stale[account_id].add(month)
+
+        for account_id, months in stale.items():
+            everything = months == months_of[account_id]  # skip the per-month ranges
+            df = _read_rows(session, account_id, None if everything else months)
+            dates = pd.to_datetime(df["date"], format="ISO8601")
+            df["date"] = dates  # Arrow casts datetime64 to date32 on write
+            for yyyymm, part in df.groupby(dates.dt.year * 100 + dates.dt.month, sort=False):
+                month = f"{yyyymm // 100}-{yyyymm % 100:02d}"
+                _write_partition(partition_path(root, names[account_id], month), part)
+                result.written += 1
+                result.rows += len(part)
+
+        live = {_key(p) for p in current}
+        for key in known.keys() - live:
+            account, month = key.rsplit("/", 1)
+            _remove_partition(root, account, month)
+            result.removed += 1
+        _write_manifest(
+            root, {"rules": rules, "partitions": {_key(p): fp for p, (_, fp) in current.items()}}
+        )
+        st.rows(rows_out=result.rows)
+    return result
+
+
+def read_table(
+    root: Path,
+    *,
+    columns: Sequence[str] | None = None,
+    accounts: Iterable[str] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> pa.Table:
+    """Scan a snapshot into an Arrow table backed by memory-mapped files.
+
+    Besides the stored columns, ``account`` and ``month`` (``YYYY-MM``) come
+    from the partition path.  Account and date filters skip whole partitions
+    before any file is opened.
+    """
+    dataset = ds.dataset(
+        root,
+        schema=pa.unify_schemas([SCHEMA, PARTITION_SCHEMA]),
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+    conditions = []
+    if accounts is not None:
+        conditions.append(ds.field("account").isin(list(accounts)))
+    if date_from is not None:
+        conditions += [ds.field("month") >= f"{date_from:%Y-%m}", ds.field("date") >= date_from]
+    if date_to is not None:
+        conditions += [ds.field("month") <= f"{date_to:%Y-%m}", ds.field("date") <= date_to]
+    where = reduce(operator.and_, conditions) if conditions else None
+    return dataset.to_table(columns=None if columns is None else list(columns), filter=where)
+
+
+def read_frame(
+    root: Path,
+    *,
+    columns: Sequence[str] | None = None,
+    accounts: Iterable[str] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> pd.DataFrame:
+    """:func:`read_table` as a pandas frame."""
+    table = read_table(
+        root, columns=columns, accounts=accounts, date_from=date_from, date_to=date_to
+    )
+    frame: pd.DataFrame = table.to_pandas()
+    return frame
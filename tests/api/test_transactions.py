@@ -0,0 +1,106 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/api/test_transactions.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from budget_app.api import app
+from budget_app.api.deps import get_sessionmaker
+from budget_app.ingest.seb import SEBIngestor
+from budget_app.models import Base
+from budget_app.services.ingest_db import add_transactions
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+@pytest.fixture()
+def client(tmp_path: Path) -> Iterator[TestClient]:
+    db = tmp_path / "api.db"
+    engine = create_engine(f"sqlite+pysqlite:///{db}")
+    Base.metadata.create_all(engine)
+    with Session(engine, autoflush=False) as sess:
+        add_transactions(sess, SEBIngestor().ingest(FIXTURE))
+        sess.commit()
+    engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db}")
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    app.dependency_overrides[get_sessionmaker] = lambda: factory
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def test_accounts(client: TestClient) -> None:
+    assert [a["name"] for a in client.get("/accounts").json()] == ["test_seb"]
+
+
+def test_keyset_pagination_walks_all_rows(client: TestClient) -> None:
+    seen: list[int] = []
+    cursor = None
+    while True:
+        params: dict[str, str | int] = {"limit": 5}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/transactions", params=params).json()
+        seen += [t["id"] for t in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 13
+    first = client.get("/transactions", params={"limit": 1}).json()["items"][0]
+    assert first["date"] == "2025-05-23"
+
+
+def test_filters(client: TestClient) -> None:
+    def ids(**params: object) -> int:
+        return len(client.get("/transactions", params=params).json()["items"])
+
+    assert ids(payee="disney") == 1
+    assert ids(payee="%") == 0
+    assert ids(date_from="2025-05-22", date_to="2025-05-22") == 3
+    assert ids(amount_min=1000) == 2
+    assert ids(amount_max=-500, account="test_seb") == 2
+    assert ids(account="nope") == 0
+    assert client.get("/transactions", params={"cursor": "junk"}).status_code == 400
+
+
+def test_payee_search(client: TestClient) -> None:
+    def payees(**params: object) -> list[str]:
+        return [t["payee"] for t in client.get("/transactions", params=params).json()["items"]]
+
+    assert payees(q="disney OR appl") == ["APPLE COM/BI/25-05-23", "DISNEY PLUS /25-05-15"]
+    assert payees(q="lon") == ["LÖN"]
+    assert payees(q="disney", account="nope") == []
+    assert client.get("/transactions", params={"q": "**"}).status_code == 400
+
+    hits = client.get("/payees/search", params={"q": "paypal | disney", "limit": 1}).json()
+    assert len(hits) == 1 and set(hits[0]) == {"payee", "score"}
+    rest = client.get("/payees/search", params={"q": "paypal | disney", "offset": 1}).json()
+    assert {h["payee"] for h in hits + rest} == {"DISNEY PLUS /25-05-15", "PAYPAL  BOAR/25-05-13"}
+
+
+def test_export_ndjson_and_csv(client: TestClient) -> None:
+    lines = client.get("/transactions/export").text.splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert len(rows) == 13
+    assert rows[0]["date"] <= rows[-1]["date"]
+
+    resp = client.get("/transactions/export", params={"format": "csv", "payee": "LÖN"})
+    assert resp.headers["content-type"].startswith("text/csv")
+    [row] = list(csv.DictReader(io.StringIO(resp.text)))
+    assert row["amount"] == "1234.0"
@@ -0,0 +1,52 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/conftest.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Shared fixtures: an in-memory database and canonical frames."""
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+import pandas as pd
+import pytest
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from budget_app.models import Base
+
+FRAME_COLUMNS = ["account_id", "date", "payee", "amount", "currency"]
+
+MakeFrame = Callable[[Sequence[tuple[Any, ...]]], pd.DataFrame]
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite+pysqlite:///:memory:", echo=False, future=True)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def session(engine: Engine) -> Iterator[Session]:
+    _Session: sessionmaker[Session] = sessionmaker(bind=engine, autoflush=False, future=True)
+    with _Session() as sess:
+        yield sess
+
+
+def _make_frame(rows: Sequence[tuple[Any, ...]]) -> pd.DataFrame:
+    """Canonical frame from ``(account_id, date, payee, amount[, currency])`` rows.
+
+    Rows without a currency are in SEK.
+    """
+    width = len(rows[0]) if rows else len(FRAME_COLUMNS)
+    df = pd.DataFrame(list(rows), columns=FRAME_COLUMNS[:width])
+    return df if "currency" in df else df.assign(currency="SEK")
+
+
+@pytest.fixture()
+def make_frame() -> MakeFrame:
+    return _make_frame
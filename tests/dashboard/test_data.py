@@ -0,0 +1,53 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/dashboard/test_data.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from budget_app.dashboard.data import (
+    data_version,
+    filter_frame,
+    load_transactions,
+    monthly_by_account,
+    top_payees,
+)
+from budget_app.ingest.seb import SEBIngestor
+from budget_app.services.ingest_db import add_transactions
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+def test_load_filter_and_group(session: Session) -> None:
+    src = SEBIngestor().ingest(FIXTURE)
+    assert data_version(session) == (0, 0)
+    add_transactions(session, src)
+    session.commit()
+    assert data_version(session)[0] == len(src)
+    df = load_transactions(session)
+
+    assert len(df) == len(src)
+    assert str(df["payee"].dtype) == "category"
+    assert df["amount_minor"].dtype == "int64"
+    assert (df["month"].dt.day == 1).all()
+
+    payee = str(src["payee"].iloc[0])
+    hits = filter_frame(df, payee=payee[1:4].lower())
+    assert payee in set(hits["payee"])
+    assert hits["payee"].str.contains(payee[1:4], case=False, regex=False).all()
+    assert filter_frame(df, accounts=["nope"]).empty
+    one_day = filter_frame(df, date_from=date(2025, 5, 22), date_to=date(2025, 5, 22))
+    assert len(one_day) == (pd.to_datetime(src["date"]) == "2025-05-22").sum() > 0
+
+    monthly = monthly_by_account(df)
+    assert monthly.to_numpy().sum() == df["amount_minor"].sum() / 100
+    top = top_payees(df, n=3)
+    assert len(top) == min(3, df["payee"].nunique())
+    assert top["total"].abs().is_monotonic_decreasing
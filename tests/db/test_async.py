@@ -0,0 +1,66 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_async.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from budget_app.config import Settings
+from budget_app.db import async_url, pool_options
+from budget_app.ingest.seb import SEBIngestor
+from budget_app.models import Account, Base, Transaction
+from budget_app.services import ingest_db
+from budget_app.services.ingest_db import add_transactions_async
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+def test_async_url_swaps_driver() -> None:
+    pg = Settings(DATABASE_URL="postgresql+psycopg2://u:p@db/budget")
+    assert async_url(pg) == "postgresql+asyncpg://u:p@db/budget"
+    assert async_url(Settings(DATABASE_URL="sqlite:///./b.db")) == "sqlite+aiosqlite:///./b.db"
+    explicit = Settings(ASYNC_DATABASE_URL="postgresql+asyncpg://x/y")
+    assert async_url(explicit) == "postgresql+asyncpg://x/y"
+    assert pool_options(async_url(pg), Settings(DB_POOL_SIZE=20))["pool_size"] == 20
+    assert pool_options("sqlite:///./b.db", pg) == {}
+
+
+def test_add_transactions_async(monkeypatch: pytest.MonkeyPatch) -> None:
+    df = SEBIngestor().ingest(FIXTURE)
+    prepared_on: set[int] = set()
+    prepare = ingest_db._prepare
+
+    def recording_prepare(frame: pd.DataFrame, *, with_raw: bool = True) -> pd.DataFrame:
+        prepared_on.add(threading.get_ident())
+        return prepare(frame, with_raw=with_raw)
+
+    monkeypatch.setattr(ingest_db, "_prepare", recording_prepare)
+
+    async def run() -> tuple[int, int, int]:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        async with factory() as session:
+            first = await add_transactions_async(session, df)
+            again = await add_transactions_async(session, df, bulk=True)
+            await session.commit()
+            acct = await Account.get_or_create_async(session=session, account_id="test_seb")
+            stmt = select(func.count()).where(Transaction.account_id == acct.id)
+            total = await session.scalar(stmt)
+        await engine.dispose()
+        return first, again, total or 0
+
+    assert asyncio.run(run()) == (len(df), 0, len(df))
+    assert prepared_on and threading.get_ident() not in prepared_on  # off the event loop
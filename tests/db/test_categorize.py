@@ -0,0 +1,77 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_categorize.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from budget_app.models import CategoryRule, Transaction
+from budget_app.services.categorize import Categorizer, Rule, add_rules, recategorize
+from budget_app.services.ingest_db import add_transactions
+
+RULES = [
+    Rule("keyword", "ica", "Groceries"),
+    Rule("keyword", "ica maxi", "Hypermarket", priority=1),
+    Rule("regex", r"^swish\b", "Transfers"),
+    Rule("exact", "LÖN", "Salary", priority=5),
+    Rule("keyword", "lön", "Income"),
+]
+
+
+def test_categorizer_priorities() -> None:
+    c = Categorizer(RULES)
+    payees = ["ICA NÄRA", "Ica Maxi Lund", "SWISH 0701234", "lön", "LÖN BONUS", "a swish", "x"]
+    expected = ["Groceries", "Hypermarket", "Transfers", "Salary", "Income", None, None]
+    assert [c.categorize(p) for p in payees] == expected
+
+    series = pd.Series(["ICA", None, "x", "ICA"], index=[3, 1, 4, 1])
+    assert c.categorize_series(series).tolist() == ["Groceries", None, None, "Groceries"]
+    assert c.categorize.cache_info().hits >= 1
+
+
+def test_invalid_rules_rejected(session: Session) -> None:
+    with pytest.raises(ValueError, match="Invalid regex"):
+        Categorizer([Rule("regex", "(", "x")])
+    with pytest.raises(ValueError, match="Unknown rule kind"):
+        Categorizer([Rule("glob", "*", "x")])
+
+    with pytest.raises(ValueError, match="Duplicate keyword rule 'ica'"):
+        add_rules(session, [RULES[0], Rule("keyword", "ica", "Food")])
+    assert add_rules(session, RULES) == len(RULES)
+    with pytest.raises(ValueError, match="Duplicate exact rule 'LÖN'"):
+        add_rules(session, [Rule("regex", "ica", "Groceries"), RULES[3]])
+    assert session.query(CategoryRule).count() == len(RULES)
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_ingest_and_recategorize(bulk: bool, session: Session) -> None:
+    df = pd.DataFrame(
+        {
+            "account_id": "A",
+            "date": ["2024-01-01", "2024-01-02", "2024-01-03"],
+            "payee": ["ICA NÄRA", "SWISH 070", "LÖN"],
+            "amount": [-10.0, -20.0, 100.0],
+            "currency": "SEK",
+        }
+    )
+    add_rules(session, RULES[:3])
+    add_transactions(session, df, bulk=bulk)
+    session.commit()
+    stmt = select(Transaction.payee, Transaction.category).order_by(Transaction.date)
+    assert session.execute(stmt).all() == [
+        ("ICA NÄRA", "Groceries"),
+        ("SWISH 070", "Transfers"),
+        ("LÖN", None),
+    ]
+
+    add_rules(session, RULES[3:])
+    session.execute(CategoryRule.__table__.delete().where(CategoryRule.kind == "regex"))
+    assert recategorize(session, batch_size=2) == 2
+    assert recategorize(session) == 0
+    assert [c for _, c in session.execute(stmt)] == ["Groceries", None, "Salary"]
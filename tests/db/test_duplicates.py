@@ -0,0 +1,124 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_duplicates.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from budget_app.ingest.batch import ingest_paths
+from budget_app.models import DuplicateCandidate, MonthlyTotal, Transaction, TransactionRaw
+from budget_app.services.duplicates import dismiss, merge, normalise, scan, similarity
+from budget_app.services.ingest_db import add_transaction_chunks, add_transactions
+
+if TYPE_CHECKING:
+    from tests.conftest import MakeFrame
+
+
+def test_similarity() -> None:
+    assert normalise("ICA NÄRA Lund/25-05-23 *4421") == "ica nara lund"
+    assert similarity("ICA NÄRA LUND", "Ica Nara Lund 1234") == 1.0
+    assert similarity("ICA NÄRA", "ICA NÄRA LUND") == 0.9
+    assert similarity("SPOTIFY AB", "SPOTIFY P2F3") > 0.8
+    assert similarity("ICA NÄRA", "SYSTEMBOLAGET") < 0.5
+    assert similarity("1234", "ICA") == 0.0
+    assert similarity("SWISH 46701234567", "Swish 46707654321") == 0.0
+    assert similarity("SWISH 46701234567", "46701234567 SWISH") == 1.0
+
+
+def test_detect_on_ingest_then_merge(session: Session, make_frame: MakeFrame) -> None:
+    account = [
+        ("A", "2024-03-01", "ICA NÄRA LUND", -149.5),
+        ("A", "2024-03-04", "SYSTEMBOLAGET", -249.0),
+        ("A", "2024-03-10", "SPOTIFY AB", -119.0),
+        ("B", "2024-03-01", "ICA NÄRA LUND", -149.5),  # other account: never a pair
+    ]
+    card = [
+        ("A", "2024-03-02", "ICA NARA LUND/24-03-01", -149.5),  # booked a day later
+        ("A", "2024-03-04", "SYSTEMBOLAGET", -250.0),  # different amount
+        ("A", "2024-03-20", "SPOTIFY AB", -119.0),  # outside the window
+        ("A", "2024-03-04", "APOTEK HJARTAT", -249.0),  # same block, other payee
+    ]
+    add_transactions(session, make_frame(account), source="AccountIngestor")
+    add_transactions(session, make_frame(card), bulk=True, source="CardIngestor")
+    session.commit()
+
+    pairs = session.execute(
+        select(DuplicateCandidate.transaction_id, DuplicateCandidate.duplicate_of_id)
+    ).all()
+    assert pairs == [(5, 1)]
+    assert scan(session) == 0  # a full rescan finds nothing new
+
+    assert scan(session, threshold=0.0) == 1  # APOTEK vs SYSTEMBOLAGET, same block
+    low = session.scalar(select(DuplicateCandidate.id).where(DuplicateCandidate.score < 0.8))
+    assert low is not None and dismiss(session, [low]) == 1
+
+    with pytest.raises(ValueError, match="candidate_ids or min_score"):
+        merge(session)  # nothing is merged without saying which pairs
+    assert merge(session, min_score=0.95) == 1
+    assert session.get(Transaction, 5) is None and session.get(Transaction, 1) is not None
+    assert session.scalars(select(DuplicateCandidate.status)).all() == ["dismissed"]
+    total = select(func.sum(MonthlyTotal.tx_count)).where(MonthlyTotal.account_id == 1)
+    assert session.scalar(total) == 6
+
+
+def test_repeated_purchases_in_one_file_are_not_duplicates(
+    session: Session, make_frame: MakeFrame
+) -> None:
+    coffees = [("A", f"2024-01-0{d}", "PRESSBYRÅN", -35.0) for d in range(1, 5)]
+    add_transactions(session, make_frame(coffees), source="AccountIngestor")
+    # the same file again, grown by a day, and a chunked load without a source
+    grown = make_frame([("A", "2024-01-05", "PRESSBYRÅN", -35.0)])
+    add_transactions(session, grown, source="AccountIngestor")
+    add_transaction_chunks(session, [make_frame([("A", "2024-01-06", "PRESSBYRÅN", -35.0)])] * 2)
+    session.commit()
+
+    assert scan(session, threshold=0.0) == 0
+    assert session.scalar(select(func.count()).select_from(DuplicateCandidate)) == 0
+    assert merge(session, min_score=0.0) == 0
+    assert session.scalar(select(func.count()).select_from(Transaction)) == 6
+
+    # a card export is another feed: paired with Jan 1–5 from the account export
+    card = make_frame([("A", "2024-01-02", "Pressbyrån 1234", -35.0)])
+    add_transactions(session, card, source="CardIngestor")
+    assert session.scalar(select(func.count()).select_from(DuplicateCandidate)) == 5
+    assert merge(session, min_score=0.95) == 1  # only the card row goes
+    assert session.scalar(select(func.count()).select_from(Transaction)) == 6
+
+
+def test_statements_of_one_feed_are_not_duplicates(tmp_path: Path, session: Session) -> None:
+    header = "Bokföringsdatum;Valutadatum;Verifikationsnummer;Text;Belopp;Saldo;Konto\n"
+    for name, day in [("jan", "2025-01-31"), ("feb", "2025-02-01")]:
+        (tmp_path / f"{name}.csv").write_text(
+            f"{header}{day};{day};1;PRESSBYRAN;-35,00;100,00;5000 1234567\n"
+        )
+    results = ingest_paths(session, sorted(tmp_path.glob("*.csv")), workers=1)
+    assert [r.inserted for r in results] == [1, 1]
+
+    scan(session, threshold=0.0)
+    assert session.scalar(select(func.count()).select_from(DuplicateCandidate)) == 0
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_merge_removes_side_stored_raw(bulk: bool, session: Session, make_frame: MakeFrame) -> None:
+    account = make_frame([("A", "2024-03-01", "ICA NÄRA LUND", -149.5)])
+    card = make_frame([("A", "2024-03-02", "ICA NARA LUND", -149.5)])
+    add_transactions(session, account, raw_storage="side", source="AccountIngestor")
+    add_transactions(session, card, raw_storage="side", source="CardIngestor")
+    assert merge(session, min_score=0.95) == 1
+    assert session.scalar(select(func.count()).select_from(TransactionRaw)) == 1
+
+    # the next row reuses the deleted rowid and must get its own payload
+    later = make_frame([("A", "2024-04-01", "SPOTIFY AB", -119.0)])
+    add_transactions(session, later, raw_storage="side", bulk=bulk, source="AccountIngestor")
+    session.commit()
+    tx = session.scalars(select(Transaction).where(Transaction.payee == "SPOTIFY AB")).one()
+    assert tx.id == 2
+    assert tx.raw_payload is not None and tx.raw_payload["payee"] == "SPOTIFY AB"
@@ -0,0 +1,98 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_fx.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from budget_app.models import ExchangeRate, Transaction
+from budget_app.services import fx, rollups
+from budget_app.services.ingest_db import add_transactions
+
+if TYPE_CHECKING:
+    from tests.conftest import MakeFrame
+
+ROWS = [
+    ("A", "2024-03-01", "ICA", -100.0, "SEK"),
+    ("E", "2024-03-01", "HOTEL", -10.0, "EUR"),  # Friday rate
+    ("E", "2024-03-03", "CAFE", -2.5, "EUR"),  # Sunday: Friday's rate still applies
+    ("E", "2024-02-20", "TAXI", -5.0, "EUR"),  # before the first rate
+    ("U", "2024-03-04", "APP", -1.0, "USD"),  # no USD rates yet
+]
+
+
+def _base_amounts(sess: Session) -> list[int | None]:
+    return list(sess.scalars(select(Transaction.amount_base_minor).order_by(Transaction.id)))
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_convert_on_ingest_and_backfill(
+    tmp_path: Path, bulk: bool, session: Session, make_frame: MakeFrame
+) -> None:
+    fx.rate_cache().clear()
+    (tmp_path / "EUR.csv").write_text('date,rate\n2024-03-01,11.5\n2024-03-04,"11,25"\n')
+    (tmp_path / "mixed.csv").write_text(
+        "date,currency,rate\n2024-02-26,usd,10.0\n2024-03-04,usd,10.5\n"
+    )
+    assert fx.load_rates_csv(session, [tmp_path / "EUR.csv"]) == 2
+    add_transactions(session, make_frame(ROWS), bulk=bulk)
+    session.commit()
+    assert _base_amounts(session) == [-10000, -11500, -2875, None, None]
+    assert fx.rate_cache().misses == 1
+
+    # the March EUR total is known, the USD month is not yet
+    totals = rollups.monthly_totals(session, in_base=True)
+    assert totals["month"].tolist() == [date(2024, 2, 1), date(2024, 3, 1)]
+    assert totals["total"].isna().tolist() == [True, True]
+    by_account = rollups.monthly_totals(session, account="E", date_from=date(2024, 3, 1))
+    assert by_account["total"].tolist() == [-12.5]
+
+    assert fx.load_rates_csv(session, [tmp_path / "mixed.csv"]) == 2
+    assert fx.backfill(session) == 1  # TAXI still has no rate on or before its date
+    assert _base_amounts(session)[-1] == -1050
+    assert fx.rate_cache().hits == 1  # EUR was unchanged
+
+    march = rollups.monthly_totals(session, in_base=True, date_from=date(2024, 3, 1))
+    assert march["total"].tolist() == [-100.0 - 115.0 - 28.75 - 10.5]
+
+    # reloading a range replaces it and invalidates the cached series
+    (tmp_path / "EUR.csv").write_text("date,rate\n2024-03-01,12.0\n")
+    assert fx.load_rates_csv(session, [tmp_path / "EUR.csv"]) == 1
+    assert fx.backfill(session, only_missing=False, batch_size=2) == 2
+    assert _base_amounts(session)[1:3] == [-12000, -3000]
+
+
+def test_stale_rates_are_not_used(session: Session) -> None:
+    days = pd.Series([date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 9)])
+    session.add(ExchangeRate(currency="NOK", date=date(2024, 1, 1), rate=0.98))
+    session.flush()
+    converted = fx.to_base(session, days, pd.Series(["NOK"] * 3), pd.Series([100, 100, 100]))
+    assert converted.tolist() == [98, 98, None]
+
+
+def test_reload_with_same_fingerprint_is_not_served_stale(
+    tmp_path: Path, session: Session
+) -> None:
+    path = tmp_path / "EUR.csv"
+    days = pd.Series([date(2024, 3, 1), date(2024, 3, 4)])
+
+    def convert() -> list[int | None]:
+        return fx.to_base(session, days, pd.Series(["EUR"] * 2), pd.Series([100, 100])).tolist()
+
+    path.write_text("date,rate\n2024-03-01,11.5\n2024-03-04,11.25\n")
+    fx.load_rates_csv(session, [path])
+    assert convert() == [1150, 1125]
+    # swapped days: same count, last day and sum
+    path.write_text("date,rate\n2024-03-01,11.25\n2024-03-04,11.5\n")
+    fx.load_rates_csv(session, [path])
+    assert convert() == [1125, 1150]
@@ -9,18 +9,19 @@ from __future__ import annotations
 from collections.abc import Iterator
 from pathlib import Path
 
+import pandas as pd
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from budget_app.ingest.seb import SEBIngestor
-from budget_app.models import Base, Transaction
-from budget_app.services.ingest_db import add_transactions
+from budget_app.config import RawStorage
+from budget_app.models import Account, Base, Transaction, TransactionRaw
+from budget_app.services.ingest_db import add_transaction_chunks, add_transactions
 
 FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
 
 
-@pytest.fixture(scope="module")
 @pytest.fixture(scope="module")
 def db_session() -> Iterator[Session]:
     engine = create_engine("sqlite+pysqlite:///:memory:", echo=False, future=True)
@@ -41,3 +42,86 @@ def test_add_transactions(db_session: Session) -> None:
 
     total = db_session.query(Transaction).count()
     assert total == len(df)
+
+
+def test_add_transactions_bulk(session: Session) -> None:
+    df = SEBIngestor().ingest(FIXTURE)
+    assert add_transactions(session, df, bulk=True) == len(df)
+    assert add_transactions(session, df, bulk=True) == 0
+    # the ORM path must agree on the hashes written by the bulk path
+    assert add_transactions(session, df) == 0
+    assert session.query(Transaction).count() == len(df)
+    assert session.query(Account).count() == 1
+
+
+def test_add_transactions_scoped_dedup(session: Session) -> None:
+    df = SEBIngestor().ingest(FIXTURE)
+    first_half, second_half = df.iloc[:6], df.iloc[6:]
+    assert add_transactions(session, first_half, scoped=True) == len(first_half)
+    assert add_transactions(session, df, scoped=True) == len(second_half)
+    assert add_transactions(session, df, scoped=True) == 0
+    assert session.query(Transaction).count() == len(df)
+    with pytest.raises(ValueError, match="scoped=True"):
+        add_transactions(session, df, scoped=True, bulk=True)
+
+
+def test_hashes_match_calc_hash(session: Session) -> None:
+    df = SEBIngestor().ingest(FIXTURE)
+    expected = {
+        Transaction.calc_hash(
+            str(r.account_id), r.date.date().isoformat(), str(r.payee), float(r.amount), r.currency
+        )
+        for r in df.itertuples()
+    }
+    add_transactions(session, df)
+    session.flush()
+    stored = {t.tx_hash for t in session.query(Transaction)}
+    assert stored == expected
+
+
+def test_add_transaction_chunks(session: Session) -> None:
+    ing = SEBIngestor()
+    assert add_transaction_chunks(session, ing.iter_chunks(FIXTURE, 4)) == 13
+    assert add_transaction_chunks(session, ing.iter_chunks(FIXTURE, 4), bulk=True) == 0
+    assert session.query(Transaction).count() == 13
+
+
+def test_amounts_stored_as_minor_units(session: Session) -> None:
+    df = pd.DataFrame(
+        {
+            "date": ["2025-01-01", "2025-01-01"],
+            "payee": ["ICA", "ICA"],
+            "amount": [0.1 + 0.2, 0.3],  # same amount once float noise is rounded away
+            "currency": "SEK",
+            "account_id": "1",
+        }
+    )
+    assert add_transactions(session, df, bulk=True) == 1
+    tx = session.query(Transaction).one()
+    assert tx.amount_minor == 30
+    assert tx.amount == 0.3
+    assert session.query(Transaction).filter(Transaction.amount > 0.29).count() == 1
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+@pytest.mark.parametrize("policy", ["inline", "side", "none"])
+def test_raw_storage_policies(policy: RawStorage, bulk: bool, session: Session) -> None:
+    df = SEBIngestor().ingest(FIXTURE)
+    assert add_transactions(session, df, bulk=bulk, raw_storage=policy) == len(df)
+    assert add_transactions(session, df, bulk=bulk, raw_storage=policy) == 0
+    session.commit()
+    session.expire_all()
+
+    side_rows = session.query(TransactionRaw).count()
+    assert side_rows == (len(df) if policy == "side" else 0)
+    tx = session.query(Transaction).filter_by(payee="LÖN").one()
+    if policy == "none":
+        assert tx.raw_payload is None
+    else:
+        assert tx.raw_payload == {
+            "date": "2025-05-23T00:00:00",
+            "payee": "LÖN",
+            "amount": 1234.0,
+            "currency": "SEK",
+            "account_id": "test_seb",
+        }
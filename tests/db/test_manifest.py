@@ -0,0 +1,65 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_manifest.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session
+
+from budget_app.ingest.batch import ingest_paths
+from budget_app.models import IngestManifest, Transaction
+from budget_app.services import manifest
+from budget_app.services.manifest import classify
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+@pytest.mark.parametrize("block", [4, 7, 1 << 20])
+def test_classify(tmp_path: Path, block: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(manifest, "READ_BLOCK", block)
+    path = tmp_path / "f.csv"
+    path.write_bytes(b"h\n1\n2\n")
+    new = classify(path, None)
+    assert new.kind == "new"
+    assert classify(path, (8, new.digest)).kind == "unchanged"
+
+    path.write_bytes(b"h\n1\n2\n3\n")
+    assert classify(path, (6, new.digest)) == ("appended", classify(path, None).digest, 6)
+
+    path.write_bytes(b"h\n1\n9\n3\n")
+    assert classify(path, (6, new.digest)).kind == "rewritten"
+
+
+def test_manifest_skips_unchanged_and_parses_tail(tmp_path: Path, session: Session) -> None:
+    path = tmp_path / "acct.csv"
+    lines = FIXTURE.read_text(encoding="utf-8").splitlines()
+    path.write_text("\n".join(lines[:8]) + "\n", encoding="utf-8")
+
+    [first] = ingest_paths(session, [path], workers=1)
+    assert (first.mode, first.inserted) == ("full", 7)
+
+    [again] = ingest_paths(session, [path], workers=1)
+    assert (again.mode, again.rows) == ("skipped", 0)
+
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write("\n".join(lines[8:]) + "\n")
+    [tail] = ingest_paths(session, [path], workers=1)
+    assert (tail.mode, tail.rows, tail.inserted) == ("tail", 6, 6)
+
+    entry = session.query(IngestManifest).one()
+    assert entry.row_count == 13
+    assert entry.ingestor == "SEBIngestor"
+    assert str(entry.date_min) == "2025-05-15"
+    assert session.query(Transaction).count() == 13
+
+    copy = tmp_path / "copy" / "acct.csv"
+    copy.parent.mkdir()
+    shutil.copy(path, copy)
+    [forced] = ingest_paths(session, [copy], workers=1, use_manifest=False)
+    assert (forced.mode, forced.inserted) == ("full", 0)
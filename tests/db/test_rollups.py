@@ -0,0 +1,80 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_rollups.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from budget_app.models import MonthlyTotal, Transaction
+from budget_app.services import rollups
+from budget_app.services.ingest_db import add_transactions
+
+if TYPE_CHECKING:
+    from tests.conftest import MakeFrame
+
+
+def _snapshot(sess: Session) -> list[tuple[object, ...]]:
+    stmt = select(
+        MonthlyTotal.account_id,
+        MonthlyTotal.month,
+        MonthlyTotal.payee,
+        MonthlyTotal.total_minor,
+        MonthlyTotal.tx_count,
+    ).order_by(MonthlyTotal.account_id, MonthlyTotal.month, MonthlyTotal.payee)
+    return [tuple(r) for r in sess.execute(stmt)]
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_rollup_tracks_inserted_months(bulk: bool, session: Session, make_frame: MakeFrame) -> None:
+    add_transactions(
+        session,
+        make_frame(
+            [
+                ("A", "2024-01-03", "ICA", -100.5),
+                ("A", "2024-01-20", "ICA", -20.25),
+                ("A", "2024-02-01", "SALARY", 30000),
+                ("B", "2024-01-15", "ICA", -9.99),
+            ]
+        ),
+        bulk=bulk,
+    )
+    assert rollups.monthly_totals(session, account="A", by_payee=True).to_dict("list") == {
+        "account": ["A", "A"],
+        "month": [date(2024, 1, 1), date(2024, 2, 1)],
+        "payee": ["ICA", "SALARY"],
+        "count": [2, 1],
+        "total": [-120.75, 30000.0],
+    }
+
+    # Only February of account A changes; a duplicate row adds nothing.
+    add_transactions(
+        session,
+        make_frame([("A", "2024-02-10", "SALARY", 100), ("A", "2024-01-03", "ICA", -100.5)]),
+        bulk=bulk,
+    )
+    totals = rollups.monthly_totals(session, account="A", date_from=date(2024, 2, 14))
+    assert totals[["count", "total"]].values.tolist() == [[2, 30100.0]]
+
+    incremental = _snapshot(session)
+    assert rollups.rebuild(session) == len(incremental)
+    assert _snapshot(session) == incremental
+
+
+def test_rollup_opt_out_and_rebuild(session: Session, make_frame: MakeFrame) -> None:
+    df = make_frame([("A", "2023-12-31", "X", 1), ("A", "2024-01-01", "X", 2)])
+    add_transactions(session, df, update_rollups=False)
+    assert _snapshot(session) == []
+
+    assert rollups.rebuild(session) == 2
+    months = session.scalars(select(MonthlyTotal.month).order_by(MonthlyTotal.month))
+    assert list(months) == [date(2023, 12, 1), date(2024, 1, 1)]
+    total = session.scalar(select(func.sum(MonthlyTotal.total_minor)))
+    assert total == session.scalar(select(func.sum(Transaction.amount_minor)))
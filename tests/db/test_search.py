@@ -0,0 +1,68 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_search.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from budget_app.models import PayeeName, Transaction
+from budget_app.services.ingest_db import add_transactions
+from budget_app.services.search import parse, payee_filter, rebuild_index, search_payees
+
+SPOTIFY = ["PAYPAL *SPOTIFY", "Spotify AB"]
+PAYEES = ["ICA NÄRA LUND", "ICA MAXI", "PAYPAL *SPOTIFY", "Spotify AB", "Löneväxling", "ICAFÉ"]
+
+
+def test_parse() -> None:
+    assert parse("ica maxi OR spot|x-y") == [["ica", "maxi"], ["spot"], ["x", "y"]]
+    with pytest.raises(ValueError, match="no words"):
+        parse(" * | ")
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_search_kept_in_sync_by_ingest(bulk: bool, session: Session) -> None:
+    df = pd.DataFrame(
+        {
+            "account_id": "A",
+            "date": [f"2024-01-{d:02d}" for d in range(1, len(PAYEES) + 2)],
+            "payee": [*PAYEES, "ICA MAXI"],
+            "amount": -1.0,
+            "currency": "SEK",
+        }
+    )
+    add_transactions(session, df, bulk=bulk)
+    session.commit()
+    assert session.scalar(select(PayeeName.id).where(PayeeName.name == "ICA MAXI")) is not None
+
+    def names(query: str, prefix: bool = True, limit: int = 20, offset: int = 0) -> list[str]:
+        hits = search_payees(session, query, prefix=prefix, limit=limit, offset=offset)
+        return [name for name, _ in hits]
+
+    assert sorted(names("ica")) == ["ICA MAXI", "ICA NÄRA LUND", "ICAFÉ"]
+    assert sorted(names("ica", prefix=False)) == ["ICA MAXI", "ICA NÄRA LUND"]
+    assert sorted(names("spotify OR nära")) == ["ICA NÄRA LUND", *SPOTIFY]
+    assert names("lonevax") == ["Löneväxling"]  # diacritics are folded
+    assert names("ica maxi") == ["ICA MAXI"]
+    assert len(names("ica", limit=2)) == 2
+    assert names("ica", limit=2, offset=2) == names("ica")[2:]
+
+    stmt = select(Transaction.payee).where(payee_filter("sqlite", "ica maxi | spotify"))
+    assert sorted(session.scalars(stmt)) == ["ICA MAXI", "ICA MAXI", *SPOTIFY]
+
+    assert rebuild_index(session) == len(PAYEES)
+    assert sorted(names("spot")) == SPOTIFY
+
+
+def test_filter_is_not_capped(session: Session) -> None:
+    payees = [f"ICA NÄRA LUND/24-{n // 28 + 1:02d}-{n % 28 + 1:02d} REF{n}" for n in range(1_500)]
+    df = pd.DataFrame({"account_id": "A", "date": "2024-01-01", "payee": payees, "amount": -1.0})
+    df["currency"] = "SEK"
+    add_transactions(session, df, bulk=True, detect_duplicates=False)
+    stmt = select(func.count()).where(payee_filter("sqlite", "ica"))
+    assert session.scalar(stmt.select_from(Transaction)) == len(payees)
@@ -0,0 +1,71 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_snapshots.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from budget_app.models import Transaction
+from budget_app.services.categorize import Rule, add_rules
+from budget_app.services.ingest_db import add_transactions
+from budget_app.services.snapshots import export_parquet, read_frame, read_table
+
+if TYPE_CHECKING:
+    from tests.conftest import MakeFrame
+
+
+def test_incremental_export_and_pruned_read(
+    tmp_path: Path, session: Session, make_frame: MakeFrame
+) -> None:
+    root = tmp_path / "snap"
+    add_transactions(
+        session,
+        make_frame(
+            [
+                ("A/1", "2024-01-05", "ICA", -10.0),
+                ("A/1", "2024-01-20", "Coop", -20.0),
+                ("A/1", "2024-02-01", "ICA", -30.0),
+                ("B", "2024-02-10", "Lön", 100.0),
+            ]
+        ),
+    )
+    session.commit()
+
+    first = export_parquet(session, root)
+    assert (first.written, first.rows, first.unchanged, first.removed) == (3, 4, 0, 0)
+    assert (root / "account=A%2F1" / "month=2024-01" / "part-0.parquet").is_file()
+    assert export_parquet(session, root).written == 0
+
+    add_transactions(session, make_frame([("A/1", "2024-02-15", "Coop", -5.0)]))
+    session.commit()
+    again = export_parquet(session, root)
+    assert (again.written, again.rows, again.unchanged) == (1, 2, 2)
+
+    session.execute(delete(Transaction).where(Transaction.amount_minor == 10_000))
+    session.commit()
+    assert export_parquet(session, root).removed == 1
+    assert not (root / "account=B").exists()
+
+    add_rules(session, [Rule("keyword", "ica", "Groceries")])
+    session.commit()
+    assert export_parquet(session, root).written == 2  # new rules: everything is rewritten
+
+    df = read_frame(root)
+    assert len(df) == 4
+    assert df["amount_minor"].sum() == -6_500
+    assert set(df["account"]) == {"A/1"}
+
+    feb = read_table(root, columns=["date", "payee"], date_from=date(2024, 2, 1))
+    assert feb.column_names == ["date", "payee"]
+    assert feb.column("payee").to_pylist() == ["ICA", "Coop"]
+    assert read_table(root, accounts=["nope"]).num_rows == 0
+    jan = read_frame(root, accounts=["A/1"], date_to=date(2024, 1, 10))
+    assert jan["payee"].tolist() == ["ICA"]
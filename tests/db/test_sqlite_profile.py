@@ -0,0 +1,145 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/db/test_sqlite_profile.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+import shutil
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from budget_app import db
+from budget_app.config import Settings
+from budget_app.ingest import batch
+from budget_app.models import Base
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+@pytest.fixture()
+def settings(tmp_path: Path) -> Settings:
+    return Settings(DATABASE_URL=f"sqlite+pysqlite:///{tmp_path / 'budget.db'}")
+
+
+@pytest.fixture()
+def configured(settings: Settings, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(db, "get_settings", lambda: settings)
+    caches = (db.get_engine, db.get_writer_engine, db.get_sessionmaker)
+    for cache in caches:
+        cache.cache_clear()
+    Base.metadata.create_all(db.get_engine())
+    yield
+    db.get_engine().dispose()
+    for cache in caches:
+        cache.cache_clear()
+
+
+def test_is_sqlite_file() -> None:
+    assert db.is_sqlite_file("sqlite:///./budget.db")
+    assert not db.is_sqlite_file("sqlite+pysqlite:///:memory:")
+    assert not db.is_sqlite_file("sqlite://")
+    assert not db.is_sqlite_file("sqlite:///file:x?mode=memory&uri=true")
+    assert not db.is_sqlite_file("postgresql://u@h/budget")
+
+
+def test_pragmas_applied(settings: Settings) -> None:
+    engine = db.build_engine(settings)
+    with engine.connect() as conn:
+        got = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in ("journal_mode", "synchronous", "busy_timeout", "temp_store")
+        }
+    engine.dispose()
+    assert got == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 60_000, "temp_store": 2}
+
+
+def test_writers_queue_and_readers_do_not_block(settings: Settings) -> None:
+    engine = db.build_engine(settings.model_copy(update={"SQLITE_BUSY_TIMEOUT_MS": 5_000}))
+    writer = engine.execution_options(sqlite_begin="IMMEDIATE")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (n INTEGER)")
+
+    first_holds_lock = threading.Event()
+
+    def slow_write() -> None:
+        with writer.begin() as conn:
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+            first_holds_lock.set()
+            time.sleep(0.3)
+
+    thread = threading.Thread(target=slow_write)
+    thread.start()
+    first_holds_lock.wait()
+    t0 = time.perf_counter()
+    with engine.connect() as reader:  # sees the last committed state, immediately
+        assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 0
+    assert time.perf_counter() - t0 < 0.2
+    with writer.begin() as conn:  # waits for the first writer instead of failing
+        conn.execute(text("INSERT INTO t VALUES (2)"))
+    thread.join()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT n FROM t ORDER BY n")).scalars().all() == [1, 2]
+    engine.dispose()
+
+
+@pytest.mark.usefixtures("configured")
+def test_session_scope_serialises_writers() -> None:
+    errors: list[BaseException] = []
+    insert = text("INSERT INTO accounts (name, currency, institution) VALUES (:n, 'SEK', 'x')")
+
+    def ingest(n: int) -> None:
+        try:
+            with db.session_scope() as session:
+                for i in range(20):
+                    session.execute(text("SELECT count(*) FROM accounts")).scalar()
+                    session.execute(insert, {"n": f"{n}-{i}"})
+        except BaseException as exc:  # noqa: BLE001 (reported below)
+            errors.append(exc)
+
+    threads = [threading.Thread(target=ingest, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with db.session_scope(write=False) as session:
+        assert session.execute(text("SELECT count(*) FROM accounts")).scalar() == 80
+
+
+@pytest.mark.usefixtures("configured")
+def test_ingest_does_not_hold_the_write_lock_while_parsing(
+    settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    files = [tmp_path / "acct_a.csv", tmp_path / "acct_b.csv"]
+    for f in files:
+        shutil.copy(FIXTURE, f)
+    database = settings.DATABASE_URL.split("///", 1)[1]
+    lock_free: list[bool] = []
+    parse_file = batch.parse_file
+
+    def checking_parse(*job: object) -> batch.Parsed:
+        other = sqlite3.connect(database, timeout=0, isolation_level=None)
+        try:
+            other.execute("BEGIN IMMEDIATE")  # another process starting to write
+            other.execute("ROLLBACK")
+            lock_free.append(True)
+        except sqlite3.OperationalError:
+            lock_free.append(False)
+        finally:
+            other.close()
+        return parse_file(*job)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(batch, "parse_file", checking_parse)
+    with db.session_scope(write=False) as reader, db.session_scope() as session:
+        results = batch.ingest_paths(session, files, workers=1, reader=reader)
+    assert [r.inserted for r in results] == [13, 13]
+    # the first file parses before anything was written; the second after a commit
+    assert lock_free == [True, True]
@@ -0,0 +1,35 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/ingest/test_batch.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Tests for parallel multi-file ingestion."""
+
+# ruff: noqa: I001
+import shutil
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from budget_app.ingest.batch import expand_paths, ingest_paths
+from budget_app.models import Transaction
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+def test_ingest_paths_reports_per_file(tmp_path: Path, session: Session) -> None:
+    (tmp_path / "sub").mkdir()
+    shutil.copy(FIXTURE, tmp_path / "acct_a.csv")
+    shutil.copy(FIXTURE, tmp_path / "sub" / "acct_a.csv")  # same account → all dups
+    shutil.copy(FIXTURE, tmp_path / "acct_b.csv")
+    (tmp_path / "notes.csv").write_text("nothing to see\n")
+
+    files = expand_paths([tmp_path])
+    assert len(files) == 4
+
+    results = ingest_paths(session, files, workers=2)
+    assert session.query(Transaction).count() == 26
+
+    by_name = {str(r.path.relative_to(tmp_path)): r for r in results}
+    assert by_name["notes.csv"].error == "no ingestor found"
+    assert sum(r.inserted for r in results) == 26
+    assert sum(r.duplicates for r in results if not r.error) == 13
+    assert all(r.ingestor == "SEBIngestor" for r in results if not r.error)
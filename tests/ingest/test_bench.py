@@ -0,0 +1,58 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/ingest/test_bench.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Tests for the synthetic export generator and the benchmark suite."""
+
+# ruff: noqa: I001
+import json
+from pathlib import Path
+
+import pytest
+
+from budget_app.ingest import get_matching_ingestor
+from budget_app.ingest.bench import (
+    BenchResult,
+    generate_exports,
+    regressions,
+    run_suite,
+    write_results,
+)
+
+
+@pytest.mark.parametrize("delimiter", [";", ",", "\t"])
+def test_generated_exports_parse(tmp_path: Path, delimiter: str) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    files, again = (
+        generate_exports(tmp_path / d, 101, accounts=2, delimiter=delimiter, duplicates=0.2)
+        for d in "ab"
+    )
+    assert [f.read_bytes() for f in files] == [f.read_bytes() for f in again]
+
+    frames = []
+    for f in files:
+        ingestor = get_matching_ingestor(f, use_cache=False)
+        assert ingestor is not None
+        frames.append(ingestor.ingest(f))
+    assert [len(df) for df in frames] == [51, 50]
+    df = frames[0]
+    assert df["account_id"].iloc[0] == files[0].stem
+    assert df.duplicated().sum() == 10
+    assert df["amount"].abs().max() > 1000  # thousands separators survived
+
+
+def test_suite_writes_results_and_flags_regressions(tmp_path: Path) -> None:
+    results = run_suite(60, accounts=2, repeat=1)
+    names = {r.name for r in results}
+    assert {"get_matching_ingestor", "SEBIngestor.parse", "ingest_paths[disk]"} <= names
+    assert "add_transactions[memory,bulk,reinsert]" in names
+
+    out = tmp_path / "bench.json"
+    write_results(out, results, rows=60)
+    doc = json.loads(out.read_text(encoding="utf-8"))
+    assert doc["meta"]["rows"] == 60
+    assert len(doc["results"]) == len(results)
+
+    slow = [BenchResult(r.name, r.items, r.median_s * 2 + 1, r.min_s, 1) for r in results]
+    assert len(regressions(slow, out)) == len(results)
+    assert regressions(results, out) == []
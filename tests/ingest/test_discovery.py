@@ -0,0 +1,59 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/ingest/test_discovery.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Tests for ingestor discovery and sniff caching."""
+
+# ruff: noqa: I001
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from budget_app.ingest import get_matching_ingestor, ingestor_classes, read_head, refresh_registry
+from budget_app.ingest.seb import SEBIngestor
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+def test_registry_is_cached_until_refreshed() -> None:
+    first = ingestor_classes()
+    assert SEBIngestor in first
+    assert ingestor_classes() is first
+    refresh_registry()
+    assert ingestor_classes() is not first
+
+
+def test_read_head_is_bounded(tmp_path: Path) -> None:
+    path = tmp_path / "big.csv"
+    path.write_text("a;b\n" + "x" * 10_000 + "\n" + "1;2\n" * 100)
+    assert read_head(path, lines=5, max_bytes=100) == "a;b\n" + "x" * 96
+    assert read_head(path, lines=2).splitlines()[0] == "a;b"
+
+
+def test_sniff_cache_keyed_on_size_and_mtime(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "acct.csv"
+    shutil.copy(FIXTURE, path)
+    calls: list[str] = []
+    original = SEBIngestor.sniff
+
+    def counting_sniff(self: SEBIngestor, sample: str, /) -> bool:
+        calls.append(sample)
+        return original(self, sample)
+
+    monkeypatch.setattr(SEBIngestor, "sniff", counting_sniff)
+    refresh_registry()
+
+    assert isinstance(get_matching_ingestor(path), SEBIngestor)
+    assert isinstance(get_matching_ingestor(path), SEBIngestor)
+    assert len(calls) == 1
+
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert isinstance(get_matching_ingestor(path), SEBIngestor)
+    assert len(calls) == 2
+
+    assert isinstance(get_matching_ingestor(path, use_cache=False), SEBIngestor)
+    assert len(calls) == 3
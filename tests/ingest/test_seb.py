@@ -8,7 +8,7 @@ from pathlib import Path
 
 import pandas as pd
 
-from budget_app.ingest.seb import SEBIngestor
+from budget_app.ingest.seb import SEBIngestor, _detect_dialect
 
 FIXTURE = Path(__file__).parent.parent / "fixtures" / "seb" / "test_seb.csv"
 
@@ -36,3 +36,62 @@ def test_parse_returns_canonical_df() -> None:
 
     # Amounts must be numeric
     assert pd.api.types.is_float_dtype(df["amount"])
+
+
+def test_fast_parser_matches_python_engine() -> None:
+    ing = SEBIngestor()
+    pd.testing.assert_frame_equal(ing.parse(FIXTURE), ing._parse_python_engine(FIXTURE))
+
+
+def test_parse_decimal_comma_and_thousands(tmp_path: Path) -> None:
+    csv_path = tmp_path / "12345678901.csv"
+    csv_path.write_text(
+        "Bokföringsdatum;Text;Belopp\n2025-05-23;LÖN;1 234,50\n2025-05-24;ICA;-12,25\n",
+        encoding="utf-8",
+    )
+    ing = SEBIngestor()
+    df = ing.parse(csv_path)
+    assert df["amount"].tolist() == [1234.5, -12.25]
+    assert (df["account_id"] == "12345678901").all()
+    pd.testing.assert_frame_equal(df, ing._parse_python_engine(csv_path))
+
+
+def test_iter_chunks_matches_ingest() -> None:
+    ing = SEBIngestor()
+    chunks = list(ing.iter_chunks(FIXTURE, 5))
+    assert [len(c) for c in chunks] == [5, 5, 3]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), ing.ingest(FIXTURE))
+
+
+def test_iter_chunks_falls_back_mid_stream(tmp_path: Path) -> None:
+    csv_path = tmp_path / "acct.csv"
+    rows = [f"2025-05-{d:02d};ROW {d};-{d}.50" for d in range(1, 9)]
+    rows.append("2025-05-09;ODD;1 234,50")  # decimal comma only after the sniffed head
+    csv_path.write_text("Bokföringsdatum;Text;Belopp\n" + "\n".join(rows) + "\n")
+    ing = SEBIngestor()
+    df = pd.concat(ing.iter_chunks(csv_path, 4), ignore_index=True)
+    pd.testing.assert_frame_equal(df, ing._parse_python_engine(csv_path))
+
+
+def test_dialect_is_detected_per_file(tmp_path: Path) -> None:
+    comma = tmp_path / "comma.csv"
+    comma.write_text("Bokföringsdatum;Text;Belopp\n2025-05-23;ICA;-12,25\n", encoding="utf-8")
+    dot = tmp_path / "dot.csv"
+    # a comma between digits in the payee is not a decimal mark
+    dot.write_text("Bokföringsdatum;Text;Belopp\n2025-05-23;ICA 2,5 KG;-12.25\n", encoding="utf-8")
+    ing = SEBIngestor()
+    assert ing.sniff(comma.read_text(encoding="utf-8"))
+    assert ing.parse(comma)["amount"].tolist() == [-12.25]
+    assert ing.parse(dot)["amount"].tolist() == [-12.25]
+    assert _detect_dialect(dot.read_text(encoding="utf-8")).decimal == "."
+
+
+def test_iter_chunks_fallback_with_multiline_payee(tmp_path: Path) -> None:
+    csv_path = tmp_path / "acct.csv"
+    rows = [f'2025-05-{d:02d};"ROW\n{d}";-{d}.50' for d in range(1, 9)]
+    rows.append("2025-05-09;ODD;1 234,50")
+    csv_path.write_text("Bokföringsdatum;Text;Belopp\n" + "\n".join(rows) + "\n")
+    ing = SEBIngestor()
+    df = pd.concat(ing.iter_chunks(csv_path, 4), ignore_index=True)
+    assert df["payee"].tolist()[:2] == ["ROW\n1", "ROW\n2"]
+    pd.testing.assert_frame_equal(df, ing._parse_python_engine(csv_path))
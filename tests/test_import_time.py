@@ -0,0 +1,55 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/test_import_time.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""Startup cost guards: the CLI must not pull in heavy modules on import."""
+
+# ruff: noqa: I001
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Final
+
+# Cumulative import time of the CLI module; ~0.2 s locally, mostly typer/rich
+CLI_IMPORT_BUDGET_US: Final = 600_000
+HEAVY: Final = ("pandas", "numpy", "sqlalchemy", "budget_app.db")
+
+
+def _import_times(code: str) -> dict[str, int]:
+    """Module → cumulative import time (µs) reported by ``-X importtime``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_is_light() -> None:
+    times = _import_times("import budget_app.ingest.cli")
+    assert [m for m in HEAVY if m in times] == []
+    assert times["budget_app.ingest.cli"] < CLI_IMPORT_BUDGET_US
+
+
+def test_engine_is_built_on_first_use() -> None:
+    code = (
+        "import sys, budget_app.models\n"
+        "assert 'budget_app.db' not in sys.modules\n"
+        "import budget_app.db as db\n"
+        "assert db.get_engine.cache_info().currsize == 0\n"
+        "assert db.SessionLocal is db.get_sessionmaker()\n"
+        "assert db.get_engine.cache_info().currsize == 1\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_sync_ingest_skips_asyncio_extension() -> None:
+    times = _import_times("import budget_app.db, budget_app.services.ingest_db")
+    assert "sqlalchemy.ext.asyncio" not in times
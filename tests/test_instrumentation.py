@@ -0,0 +1,54 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tests/test_instrumentation.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ruff: noqa: I001
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from budget_app import instrumentation
+from budget_app.ingest import get_matching_ingestor
+from budget_app.services.ingest_db import add_transactions
+
+FIXTURE = Path(__file__).parent / "fixtures" / "seb" / "test_seb.csv"
+
+
+def test_stages_rows_and_sql_counts(session: Session) -> None:
+    with instrumentation.collect() as stats:
+        ingestor = get_matching_ingestor(FIXTURE, use_cache=False)
+        assert ingestor is not None
+        df = ingestor.ingest(FIXTURE)
+        add_transactions(session, df)
+        add_transactions(session, df, bulk=True)
+
+    stages = stats.stages
+    assert stages["sniff"].calls == 1
+    assert stages["parse"].rows_out == len(df)
+    add = stages["add_transactions"]
+    assert (add.calls, add.rows_in, add.rows_out, add.duplicates) == (2, 2 * len(df), 13, 13)
+    assert stages["add_transactions.dedup"].sql_statements >= 1
+    assert 0 < add.sql_statements <= stats.sql_statements
+    assert add.seconds >= stages["add_transactions.prepare"].seconds
+
+    doc = json.loads(stats.to_json())
+    assert {s["name"] for s in doc["stages"]} == set(stages)
+    prom = stats.to_prometheus()
+    assert 'budget_stage_rows_out_total{stage="parse"} 13' in prom
+    assert f"budget_sql_statements_total {stats.sql_statements}" in prom
+    assert "add_transactions" in stats.to_text()
+
+
+def test_disabled_collects_nothing() -> None:
+    assert instrumentation.current() is None
+    with instrumentation.stage("sniff") as st:
+        st.rows(rows_out=1)
+    assert st.rows_out == 0  # the stand-in stage does not accumulate either
+    instrumentation.record("parse_file", 1.0)
+    with instrumentation.collect() as stats:
+        pass
+    assert stats.stages == {}